@@ -0,0 +1,498 @@
+# benchmarks.py
+"""Offline micro-benchmarks on a synthetic IPL season.
+
+Usage: python benchmarks.py <name> [--matches N]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from json_storage import (STORAGE_FORMATS, RAW_PAYLOAD_FORMATS, encode_json, decode_json, read_json_text,
+                          compress_payload, decode_raw_json, scorecard_hot_fields, zstandard)
+from raw_sources import LocalDirectorySource, ArchiveSource, pack_source
+
+TEAMS = [
+    ("Mumbai Indians", "MI"), ("Chennai Super Kings", "CSK"), ("Royal Challengers Bengaluru", "RCB"),
+    ("Delhi Capitals", "DC"), ("Gujarat Titans", "GT"), ("Lucknow Super Giants", "LSG"),
+    ("Kolkata Knight Riders", "KKR"), ("Punjab Kings", "PBKS"), ("Rajasthan Royals", "RR"),
+    ("Sunrisers Hyderabad", "SRH")
+]
+FIRST_NAMES = ["Rohit", "Virat", "Shubman", "Rishabh", "Hardik", "Jasprit", "Ravindra", "Suryakumar",
+               "Yashasvi", "Sanju", "Kuldeep", "Arshdeep", "Mohammed", "Axar", "Ruturaj", "Tilak"]
+LAST_NAMES = ["Sharma", "Kohli", "Gill", "Pant", "Pandya", "Bumrah", "Jadeja", "Yadav",
+              "Jaiswal", "Samson", "Singh", "Siraj", "Patel", "Gaikwad", "Varma", "Iyer"]
+
+
+def match_folder(match_no):
+    (t1, _), (t2, _) = _teams_for(match_no)
+    return f"{100000 + match_no}_{t1.replace(' ', '')}_vs_{t2.replace(' ', '')}"
+
+
+def _teams_for(match_no):
+    i = match_no % len(TEAMS)
+    return TEAMS[i], TEAMS[(i + 1 + match_no // len(TEAMS)) % len(TEAMS)]
+
+
+def _squad(team_index):
+    rng = random.Random(team_index)
+    return [(team_index * 100 + k, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}") for k in range(11)]
+
+
+def synthetic_scorecard(match_no):
+    """A scorecard shaped like the Cricbuzz /scard payload the pipeline consumes"""
+    rng = random.Random(match_no)
+    (t1, s1), (t2, s2) = _teams_for(match_no)
+    squads = {t1: _squad(TEAMS.index((t1, s1))), t2: _squad(TEAMS.index((t2, s2)))}
+    innings = []
+    totals = {}
+    for innings_id, (bat, bowl) in enumerate([(t1, t2), (t2, t1)], start=1):
+        batsmen, score, wickets = [], 0, 0
+        for pid, name in squads[bat][:rng.randint(5, 11)]:
+            runs, balls = rng.randint(0, 80), rng.randint(1, 50)
+            out = rng.random() < 0.8
+            fielder = rng.choice(squads[bowl])[1]
+            bowler = rng.choice(squads[bowl][6:])[1]
+            batsmen.append({
+                "id": pid, "name": name, "runs": runs, "balls": balls,
+                "fours": runs // 10, "sixes": runs // 25, "strkRate": f"{runs * 100 / balls:.2f}",
+                "outDec": (f"c {fielder} b {bowler}" if rng.random() < 0.6 else f"b {bowler}") if out else "not out"
+            })
+            score += runs
+            wickets += int(out)
+        bowlers = [{
+            "id": pid, "name": name, "overs": "4", "maidens": 0, "runs": rng.randint(20, 50),
+            "wickets": rng.randint(0, 3), "economy": f"{rng.uniform(6, 12):.2f}"
+        } for pid, name in squads[bowl][6:]]
+        extras = rng.randint(2, 15)
+        totals[bat] = score + extras
+        innings.append({
+            "inningsId": innings_id, "batTeamName": bat, "batTeamSName": s1 if bat == t1 else s2,
+            "score": score + extras, "wickets": min(wickets, 10), "overs": 20,
+            "batsman": batsmen, "bowler": bowlers, "extras": {"total": extras},
+            "pp": {"powerPlay": [{"ppType": "mandatory", "ovrFrom": 0.1, "ovrTo": 6.0, "run": rng.randint(30, 80)}]}
+        })
+    winner = max(totals, key=totals.get)
+    return {
+        "scorecard": innings,
+        "status": f"{winner} won by {rng.randint(1, 60)} runs",
+        "appIndex": {"seoTitle": f"{s1} vs {s2}, {match_no}th Match, Indian Premier League 2025"},
+        "matchHeader": {
+            "matchStartTimestamp": 1742000000000 + match_no * 86400000,
+            "team1": {"name": t1, "shortName": s1}, "team2": {"name": t2, "shortName": s2}
+        }
+    }
+
+
+def synthetic_commentary(match_no):
+    """Ball-by-ball commentary shaped like the Cricbuzz /comm commentaryList payload"""
+    rng = random.Random(-match_no - 1)
+    (t1, _), (t2, _) = _teams_for(match_no)
+    entries = []
+    timestamp = 1742000000000 + match_no * 86400000
+    for innings_id, (bat, bowl) in enumerate([(t1, t2), (t2, t1)], start=1):
+        bat_squad = _squad(TEAMS.index(next(t for t in TEAMS if t[0] == bat)))
+        bowl_squad = _squad(TEAMS.index(next(t for t in TEAMS if t[0] == bowl)))
+        for over in range(20):
+            bowler_id, bowler = bowl_squad[6 + over % 5]
+            for ball in range(1, 7):
+                timestamp += 40000
+                batter_id, batter = rng.choice(bat_squad[:7])
+                runs = rng.choice([0, 0, 1, 1, 1, 2, 4, 6])
+                event = {4: "FOUR", 6: "SIX"}.get(runs, "NONE")
+                text = f"{bowler} to {batter}, {runs if runs else 'no'} run{'s' if runs != 1 else ''}, " \
+                       f"{rng.choice(['driven through cover', 'worked to midwicket', 'defended back', 'flicked fine'])}"
+                if rng.random() < 0.02:
+                    text += f", dropped! {rng.choice(bowl_squad)[1]} puts down a sitter at long-on"
+                entries.append({
+                    "commText": text, "timestamp": timestamp, "inningsId": innings_id,
+                    "overNumber": float(f"{over}.{ball}"), "ballNbr": over * 6 + ball, "event": event,
+                    "batTeamName": bat,
+                    "batsmanStriker": {"batId": batter_id, "batName": batter, "batRuns": runs},
+                    "bowlerStriker": {"bowlId": bowler_id, "bowlName": bowler},
+                    "commentaryFormats": {}
+                })
+    entries.reverse()  # Cricbuzz lists newest first
+    return {"commentaryList": entries, "matchHeader": {"matchId": 100000 + match_no}}
+
+
+def synthetic_season(matches=74):
+    for match_no in range(1, matches + 1):
+        yield match_folder(match_no), synthetic_scorecard(match_no), synthetic_commentary(match_no)
+
+
+def write_season_tree(root, matches, storage_format="pretty"):
+    """Write a synthetic season to `root` in the bucket layout, for LocalDirectorySource"""
+    for folder, scard, comm in synthetic_season(matches):
+        os.makedirs(os.path.join(root, folder), exist_ok=True)
+        for kind, doc in (("scard", scard), ("comm", comm)):
+            with open(os.path.join(root, folder, f"{folder}_{kind}.json"), "wb") as f:
+                f.write(encode_json(doc, storage_format)[0])
+
+
+def bench_storage(matches):
+    """Bytes stored per S3 storage format and local decode time (transfer time scales with bytes)"""
+    season = [(scard, comm) for _, scard, comm in synthetic_season(matches)]
+    formats = [f for f in STORAGE_FORMATS if f != "zstd" or zstandard is not None]
+    baseline_bytes = baseline_time = None
+    print(f"{'format':<10} {'bytes':>14} {'vs pretty':>10} {'load s':>9} {'vs pretty':>10}")
+    for fmt in formats:
+        encoded = [encode_json(doc, fmt) for pair in season for doc in pair]
+        bodies = [(body, put_kwargs.get('ContentEncoding')) for body, put_kwargs in encoded]
+        total_bytes = sum(len(body) for body, _ in bodies)
+        started = time.perf_counter()
+        for body, encoding in bodies:
+            decode_json(body, encoding)
+        elapsed = time.perf_counter() - started
+        baseline_bytes = baseline_bytes or total_bytes
+        baseline_time = baseline_time or elapsed
+        print(f"{fmt:<10} {total_bytes:>14,} {total_bytes / baseline_bytes:>9.1%} {elapsed:>9.3f} {elapsed / baseline_time:>9.1%}")
+
+
+def bench_sources(matches):
+    """Listing + reading every match through each offline raw source backend"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "season")
+        write_season_tree(root, matches)
+        archive_path = os.path.join(tmp, "season.iplpack")
+        pack_source(LocalDirectorySource(root), archive_path)
+
+        print(f"{'source':<10} {'objects':>8} {'MB':>8} {'list s':>8} {'read s':>8} {'MB/s':>8}")
+        for name, source in (("directory", LocalDirectorySource(root)), ("archive", ArchiveSource(archive_path))):
+            started = time.perf_counter()
+            listing = source.list_match_objects()
+            listed = time.perf_counter()
+            total_bytes = objects = 0
+            for files in listing.values():
+                for key, _ in files.values():
+                    body, encoding = source.read(key)
+                    read_json_text(body, encoding)
+                    total_bytes += len(body)
+                    objects += 1
+            elapsed = time.perf_counter() - listed
+            source.close()
+            print(f"{name:<10} {objects:>8} {total_bytes / 1e6:>8.1f} {listed - started:>8.3f} {elapsed:>8.3f} "
+                  f"{total_bytes / 1e6 / elapsed:>8.0f}")
+
+
+def bench_raw_layout(matches):
+    """RAW row bytes and scan time: JSON column vs compressed payload + hot fields.
+
+    Bytes are the document bytes a full scan pulls through the buffer pool (compressed
+    BLOBs sit off-page, so hot-column queries touch only the hot bytes). For real table
+    sizes run RawProcessor.report_storage_footprint() against a loaded database.
+    """
+    texts = [json.dumps(scard) for _, scard, _ in synthetic_season(matches)]
+    formats = [f for f in RAW_PAYLOAD_FORMATS if f != "zstd" or zstandard is not None]
+    baseline = None
+    print(f"{matches} matches ({matches / 74:.1f} seasons) of scorecards")
+    print(f"{'layout':<8} {'doc bytes':>12} {'vs json':>8} {'hot bytes':>10} {'full scan s':>12} {'hot scan s':>11}")
+    for fmt in formats:
+        if fmt == "json":
+            rows = [(text, None, None, None) for text in texts]
+        else:
+            rows = [(None, compress_payload(text, fmt), fmt, json.dumps(scorecard_hot_fields(json.loads(text))))
+                    for text in texts]
+        doc_bytes = sum(len(r[0] or r[1]) for r in rows)
+        hot_bytes = sum(len(r[3] or "") for r in rows)
+
+        started = time.perf_counter()
+        for row in rows:
+            decode_raw_json(*row[:3])
+        full_scan = time.perf_counter() - started
+
+        # Reading team/status/start time: JSON layout parses the document, the other reads hot fields
+        started = time.perf_counter()
+        for row in rows:
+            json.loads(row[3]) if row[3] else json.loads(row[0])
+        hot_scan = time.perf_counter() - started
+
+        baseline = baseline or doc_bytes
+        print(f"{fmt:<8} {doc_bytes:>12,} {doc_bytes / baseline:>7.1%} {hot_bytes:>10,} {full_scan:>12.3f} {hot_scan:>11.4f}")
+
+
+class SimulatedConnection:
+    """DB-API stand-in charging a fixed round trip per statement and an fsync per commit"""
+
+    def __init__(self, statement_ms=0.2, commit_ms=1.0, row_us=2.0):
+        self.statement_s, self.commit_s, self.row_s = statement_ms / 1000, commit_ms / 1000, row_us / 1e6
+
+    def is_connected(self):
+        return True
+
+    def cursor(self, *args, **kwargs):
+        return self
+
+    def execute(self, query, params=None):
+        time.sleep(self.statement_s + self.row_s)
+
+    def executemany(self, query, seq_params):
+        time.sleep(self.statement_s + self.row_s * len(seq_params))
+
+    def commit(self):
+        time.sleep(self.commit_s)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def bench_silver_writes(matches):
+    """SILVER write throughput: one INSERT + commit per row vs batched multi-row transactions.
+
+    Uses the real TransformProcessor row builder and writer against SimulatedConnection
+    (0.2 ms per statement, 1 ms per commit), so it needs the pipeline's Python deps but no database.
+    """
+    import transform_processor
+
+    processor = transform_processor.TransformProcessor._offline()
+    processor.connection = SimulatedConnection()
+    pending = [(folder, processor._build_silver_rows(folder, scard), None, None)
+               for folder, scard, _ in synthetic_season(matches)]
+    total_rows = sum(1 + len(rows[1]) + len(rows[2]) + len(rows[3]) + len(rows[4]) for _, rows, _, _ in pending)
+
+    started = time.perf_counter()
+    for _, (summary, batting, bowling, extras, players), _, _ in pending:
+        for query, row in [(transform_processor.SILVER_SUMMARY_INSERT, summary)] + \
+                          [(transform_processor.SILVER_BATTING_INSERT, r) for r in batting] + \
+                          [(transform_processor.SILVER_BOWLING_INSERT, r) for r in bowling] + \
+                          [(transform_processor.SILVER_EXTRAS_INSERT, r) for r in extras] + \
+                          [(transform_processor.SILVER_PLAYERS_INSERT, r) for r in players]:
+            processor.connection.execute(query, row)
+            processor.connection.commit()
+    baseline = time.perf_counter() - started
+    print(f"{total_rows} SILVER rows from {matches} matches")
+    print(f"{'strategy':<24} {'seconds':>8} {'rows/s':>9} {'speedup':>8}")
+    print(f"{'per-row commit':<24} {baseline:>8.3f} {total_rows / baseline:>9,.0f} {1:>7.1f}x")
+
+    for batch_size in (1, 250, 1000, 5000):
+        processor.silver_batch_size = batch_size
+        started = time.perf_counter()
+        batch, batch_rows = [], 0
+        for item in pending:
+            batch.append(item)
+            batch_rows += len(item[1][1]) + len(item[1][2])
+            if batch_rows >= batch_size:
+                processor._flush_silver(batch)
+                batch, batch_rows = [], 0
+        processor._flush_silver(batch)
+        elapsed = time.perf_counter() - started
+        print(f"{f'batched, size {batch_size}':<24} {elapsed:>8.3f} {total_rows / elapsed:>9,.0f} {baseline / elapsed:>7.1f}x")
+
+
+def bench_silver_parse(matches):
+    """SILVER scorecard parsing: serial vs process pool, checking the rows are identical"""
+    import transform_processor
+
+    records = [(folder, json.dumps(scard), None, None, None, None) for folder, scard, _ in synthetic_season(matches)]
+    processor = transform_processor.TransformProcessor._offline()
+    reference = serial = None
+    print(f"{matches} scorecards, {os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'seconds':>8} {'matches/s':>10} {'speedup':>8} {'identical':>10}")
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        processor.parse_workers = workers
+        started = time.perf_counter()
+        parsed = list(processor._parse_records(records))
+        elapsed = time.perf_counter() - started
+        reference = reference or parsed
+        serial = serial or elapsed
+        print(f"{workers:>7} {elapsed:>8.3f} {matches / elapsed:>10.0f} {serial / elapsed:>7.1f}x {str(parsed == reference):>10}")
+
+
+def standings_inputs(seasons, matches):
+    """The three standings inputs for `seasons` synthetic seasons, with some no-results,
+    super overs, ties, all-out innings and a missing team name mixed in"""
+    import transform_processor
+
+    processor = transform_processor.TransformProcessor._offline()
+    summaries, batting, extras_rows = [], {}, []
+    for season in range(seasons):
+        for match_no, (folder, scard, _) in enumerate(synthetic_season(matches), start=1):
+            match_id = f"{season + 1:02d}{folder}"
+            summary, batting_rows, _, extras, _ = processor._build_silver_rows(match_id, scard)
+            summary = dict(zip(("match_id", "team1_name", "team2_name", "match_winner", "match_status", "is_tie", "is_no_result"),
+                               (summary[0], summary[6], summary[7], summary[10], summary[13], summary[14], summary[15])))
+            if match_no % 17 == 0:
+                summary.update(match_winner=None, match_status="No result", is_no_result=1)
+                if match_no % 34 == 0:
+                    summary["team2_name"] = None
+            elif match_no % 23 == 0:
+                summary.update(match_status=f"Match tied ({summary['team2_name']} won the super over)", is_tie=1)
+            elif match_no % 29 == 0:
+                summary.update(match_winner=None, match_status="Match tied", is_tie=1)
+            summaries.append(summary)
+            for row in batting_rows:
+                totals = batting.setdefault((match_id, row[9]), [0, 0, 0])
+                totals[0] += row[2]; totals[1] += row[3]; totals[2] += row[11]
+            extras_rows += [(row[0], row[2], row[3]) for row in extras]
+    batting_rows = []
+    for n, ((match_id, team), (runs, balls, wickets)) in enumerate(batting.items()):
+        if n % 7 == 0:
+            balls, wickets = min(balls, 90), 10
+        batting_rows.append((match_id, team, runs, balls, wickets))
+    summaries.sort(key=lambda summary: summary["match_id"])
+    return processor, summaries, batting_rows, extras_rows
+
+
+def bench_standings(matches):
+    """Points table/NRR: reference per-match loop vs the numpy engine, checking identical output"""
+    import standings_engine
+
+    print(f"{'seasons':>7} {'matches':>8} {'python s':>9} {'numpy s':>8} {'speedup':>8} {'identical':>10}")
+    for seasons in (1, 5, 20, 50):
+        processor, summaries, batting_rows, extras_rows = standings_inputs(seasons, matches)
+        started = time.perf_counter()
+        reference = processor._compute_standings_reference(summaries, batting_rows, extras_rows)
+        python_s = time.perf_counter() - started
+        started = time.perf_counter()
+        vectorized = standings_engine.compute_standings(summaries, batting_rows, extras_rows, processor._normalize_team_name)
+        numpy_s = time.perf_counter() - started
+        print(f"{seasons:>7} {len(summaries):>8} {python_s:>9.4f} {numpy_s:>8.4f} {python_s / numpy_s:>7.1f}x "
+              f"{str(vectorized == reference):>10}")
+
+
+DROP_PHRASINGS = [
+    "dropped by {f}, a regulation chance at point",
+    "{f} drops it at deep square leg",
+    "{f} and {o} converge, the latter spills it",
+    "{f} and {o} converge, the former puts it down",
+    "missed chance by {f} at short cover",
+    "{f} couldn't hold on at long-off",
+    "{f} shells it, straight in and out",
+    "that's a spill, nobody near it",
+]
+
+
+def commentary_corpus(matches):
+    """commText lines of a synthetic season, plus one line per drop phrasing every over"""
+    lines = []
+    for _, _, commentary in synthetic_season(matches):
+        entries = commentary["commentaryList"]
+        lines += [entry["commText"] for entry in entries]
+        for i, entry in enumerate(entries[::6]):
+            fielder, other = entry["bowlerStriker"]["bowlName"], entry["batsmanStriker"]["batName"]
+            lines.append(f"{entry['commText']}, " + DROP_PHRASINGS[i % len(DROP_PHRASINGS)].format(f=fielder, o=other))
+    return lines
+
+
+def bench_drop_matcher(matches):
+    """Dropped-catch parsing per commentary line: one re.search per keyword and phrasing vs the compiled matcher"""
+    import commentary_matchers as cm
+
+    lines = commentary_corpus(matches)
+
+    def per_pattern(text):
+        if not any(keyword in text.lower() for keyword in cm.DROP_KEYWORDS):
+            return False
+        return cm.match_dropped_catch_reference(text)
+
+    def compiled(text):
+        if not cm.has_drop_keyword(text):
+            return False
+        return cm.match_dropped_catch(text)
+
+    print(f"{len(lines)} commentary lines, {sum(cm.has_drop_keyword(line) for line in lines)} with a drop keyword")
+    print(f"{'matcher':<12} {'seconds':>8} {'ns/line':>8} {'speedup':>8}")
+    results, baseline = {}, None
+    for name, matcher in (("per-pattern", per_pattern), ("compiled", compiled)):
+        started = time.perf_counter()
+        results[name] = [matcher(line) for line in lines]
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(f"{name:<12} {elapsed:>8.3f} {elapsed / len(lines) * 1e9:>8,.0f} {baseline / elapsed:>7.1f}x")
+    print(f"identical: {results['per-pattern'] == results['compiled']}")
+
+
+def _typo(rng, name):
+    """`name` with one letter dropped, doubled or swapped with its neighbour"""
+    i = rng.randrange(1, len(name) - 1)
+    return rng.choice([name[:i] + name[i + 1:], name[:i] + name[i] + name[i:],
+                       name[:i] + name[i + 1] + name[i] + name[i + 2:]])
+
+
+def bench_name_index(matches):
+    """Fuzzy player-name resolution: fuzz.ratio against every known name vs NameIndex, checking identical results"""
+    from fuzzywuzzy import fuzz
+    import commentary_matchers as cm
+    from name_index import NameIndex
+    from player_maps import build_player_map
+    from team_names import default_resolver
+
+    rng = random.Random(0)
+    work = []
+    for _, scorecard, commentary in synthetic_season(matches):
+        _, name_to_id_map = build_player_map(scorecard, lambda name: default_resolver.resolve(name) or "Unknown")
+        known = list(name_to_id_map)
+        lines = [entry["commText"] for entry in commentary["commentaryList"]]
+        lines = [f"{line}, {_typo(rng, rng.choice(known)).title()} gets a hand to it" if i % 3 == 0 else line
+                 for i, line in enumerate(lines)]
+        outdec_names = [_typo(rng, name) for name in known] + [name.split()[-1] for name in known]
+        work.append((name_to_id_map, lines, outdec_names))
+
+    def every_name(name_to_id_map, lines, outdec_names):
+        resolved = []
+        for text in lines:
+            best_score, best_name = 80, None
+            for name in cm.NAME_PHRASE_RE.findall(text):
+                for known_name_lower in name_to_id_map:
+                    score = fuzz.ratio(name.lower(), known_name_lower)
+                    if score > best_score:
+                        best_score, best_name = score, name
+            resolved.append(best_name if best_score >= 85 else None)
+        for name in outdec_names:
+            best_s, temp_id = 0, None
+            for n_key_lower, p_id_val in name_to_id_map.items():
+                s = fuzz.ratio(name, n_key_lower)
+                if s > best_s: best_s, temp_id = s, p_id_val
+            resolved.append(temp_id if best_s >= 90 else None)
+        return resolved
+
+    def indexed(name_to_id_map, lines, outdec_names):
+        index, resolved = NameIndex(name_to_id_map), []
+        for text in lines:
+            best_score, best_name = 80, None
+            for name in cm.NAME_PHRASE_RE.findall(text):
+                score, _ = index.best_match(name.lower(), max(best_score + 1, 85))
+                if score > best_score:
+                    best_score, best_name = score, name
+            resolved.append(best_name if best_score >= 85 else None)
+        for name in outdec_names:
+            _, key = index.best_match(name, 90)
+            resolved.append(name_to_id_map[key] if key is not None else None)
+        return resolved
+
+    lookups = sum(len(lines) + len(names) for _, lines, names in work)
+    print(f"{lookups} lookups ({matches} matches, ~{len(work[0][0])} known names each)")
+    print(f"{'resolver':<10} {'seconds':>8} {'us/lookup':>10} {'speedup':>8}")
+    results, baseline = {}, None
+    for name, resolver in (("every name", every_name), ("NameIndex", indexed)):
+        started = time.perf_counter()
+        results[name] = [resolver(*item) for item in work]
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(f"{name:<10} {elapsed:>8.3f} {elapsed / lookups * 1e6:>10.1f} {baseline / elapsed:>7.1f}x")
+    print(f"identical: {results['every name'] == results['NameIndex']}")
+
+
+BENCHMARKS = {
+    "storage": bench_storage,
+    "sources": bench_sources,
+    "raw_layout": bench_raw_layout,
+    "silver_writes": bench_silver_writes,
+    "silver_parse": bench_silver_parse,
+    "standings": bench_standings,
+    "drop_matcher": bench_drop_matcher,
+    "name_index": bench_name_index,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("name", choices=sorted(BENCHMARKS))
+    parser.add_argument("--matches", type=int, default=74, help="matches in the synthetic season")
+    args = parser.parse_args()
+    BENCHMARKS[args.name](args.matches)
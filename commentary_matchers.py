@@ -0,0 +1,82 @@
+# commentary_matchers.py
+"""Precompiled matchers for dropped-catch commentary and dismissal descriptions.
+
+A dropped catch is recognised in two steps. One regex over the lowercased line checks
+for any drop keyword, which rejects the ordinary deliveries (nearly all of them) in a
+single scan. Lines that pass are matched against all drop phrasings at once: every
+phrasing is a lookahead alternative with its own named groups, tried in DROP_PATTERNS
+order, so the phrasing that wins and the position it matches at are the same as with
+one re.search per pattern. Names are matched without backtracking inside words and only
+from positions where a leftmost match can start, which is where most of the time went.
+"""
+import re
+
+DROP_KEYWORDS = ["dropped!", "spills", "drops", "put down", "missed chance", "spill", "misfield"]
+
+# A run of capitalised words, i.e. a player name (any run of letters once IGNORECASE applies)
+NAME = r"[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*"
+# The same name, but words and gaps are taken whole: every name is followed by whitespace
+# or ends the pattern, so giving letters back can never produce a match
+COMPILED_NAME = r"[A-Z][a-z]+(?![a-z])(?:\s+(?!\s)[A-Z][a-z]+(?![a-z]))*"
+# Where a name leading a phrasing can start. Not right after a letter, nor one word into
+# another name: from those positions the leftmost match would have started earlier
+COMPILED_NAME_START = r"(?<![a-z])(?<![a-z][a-z]\s)"
+
+# (group name, pattern) in priority order; "converge" names two fielders
+DROP_PATTERNS = [
+    ("dropped_by", r"dropped by\s+(?P<dropped_by>{name})"),
+    ("drops", r"{start}(?P<drops>{name})\s+(?:drops\b|spills|puts down|misfields)"),
+    ("converge", r"{start}(?P<converge>{name})\s+and\s+(?P<converge_other>{name})\s+converge,\s+(?:the former|the latter)"),
+    ("missed_chance", r"missed chance\s+by\s+(?P<missed_chance>{name})"),
+    ("hold_on", r"{start}(?P<hold_on>{name})\s+couldn't\s+hold\s+on"),
+    ("shells", r"{start}(?P<shells>{name})\s+shells\s+it"),
+]
+
+DROP_KEYWORD_RE = re.compile("|".join(re.escape(keyword) for keyword in DROP_KEYWORDS))
+DROPPED_CATCH_RE = re.compile("|".join(
+    r"(?=[\s\S]*?" + pattern.format(name=COMPILED_NAME, start=COMPILED_NAME_START) + ")"
+    for _, pattern in DROP_PATTERNS), re.IGNORECASE)
+
+# Capitalised phrases (candidate player names) in a commentary line, matched case-sensitively
+NAME_PHRASE_RE = re.compile(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b")
+
+# Fielder / bowler in a scorecard outDec such as "c Kohli b Siraj" or "b Bumrah"
+OUTDEC_CAUGHT_RE = re.compile(r"c\s+([^b(]+?)\s*(?:b|run out|\(sub\)|st\s|\W*$)", re.IGNORECASE)
+OUTDEC_C_AND_B_BOWLER_RE = re.compile(r"c\s+&\s+b\s+([\w\s.-]+)", re.IGNORECASE)
+OUTDEC_CAUGHT_BY_RE = re.compile(r"caught by\s+([\w\s.-]+?)(?:\s+b\s+|$)", re.IGNORECASE)
+OUTDEC_C_AND_B_RE = re.compile(r"c & b\s+([\w\s.-]+)", re.IGNORECASE)
+OUTDEC_BARE_B_RE = re.compile(r"\sb\s(?!\S)")
+OUTDEC_BOWLER_RE = re.compile(r"(?:^b\s+|^bowled\s+|\sb\s+)([\w\s.'-]+?)(?:\s*\(|\s*$|\[)", re.IGNORECASE)
+OUTDEC_BOWLER_LOOSE_RE = re.compile(r"(?:b|bowled)\s+([\w\s.'-]+)", re.IGNORECASE)
+
+
+def has_drop_keyword(comm_text):
+    return DROP_KEYWORD_RE.search(comm_text.lower()) is not None
+
+
+def _fielder(groups, comm_text):
+    """Fielder named by the phrasing that matched, from its named groups"""
+    for name, _ in DROP_PATTERNS:
+        fielder = groups[name]
+        if fielder is not None:
+            if name == "converge" and 'former' not in comm_text and 'latter' in comm_text:
+                return groups["converge_other"].strip()
+            return fielder.strip()
+    return None
+
+
+def match_dropped_catch(comm_text):
+    """Fielder named by the first drop phrasing that matches `comm_text`, or None"""
+    match = DROPPED_CATCH_RE.match(comm_text)
+    return _fielder(match.groupdict(), comm_text) if match else None
+
+
+def match_dropped_catch_reference(comm_text):
+    """match_dropped_catch done the original way, one re.search per phrasing (for benchmarks)"""
+    for name, pattern in DROP_PATTERNS:
+        match = re.search(pattern.format(name=NAME, start=""), comm_text, re.IGNORECASE)
+        if match:
+            groups = dict.fromkeys(n for n, _ in DROP_PATTERNS)
+            groups.update(match.groupdict())
+            return _fielder(groups, comm_text)
+    return None
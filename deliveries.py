@@ -0,0 +1,125 @@
+# deliveries.py
+"""One silver_deliveries row per ball, parsed from a /comm commentary document.
+
+Cricbuzz ball entries read "<bowler> to <batter>, <outcome>, <colour>": the outcome
+clause gives the runs ("no run", "2 runs", "FOUR"), extras ("wide", "2 wides",
+"no ball", "leg byes, 1 run") or a dismissal ("out Caught by Rohit!!"). Ids, innings,
+over and the FOUR/SIX/WICKET event come from the entry's own fields; a drop is flagged
+when one of commentary_matchers' drop phrasings names the fielder. Entries without an
+over number or that do not read like a delivery (over summaries, match notes) are
+skipped. fielder_name is the fielder credited with a dismissal, dropped_by the one who
+put a chance down.
+"""
+import re
+
+from commentary_matchers import has_drop_keyword, match_dropped_catch
+from live_commentary import commentary_entries
+
+DELIVERY_RE = re.compile(r"^\s*(?P<bowler>[^,]+?)\s+to\s+(?P<batter>[^,]+?)\s*,\s*(?P<outcome>.*)$", re.DOTALL)
+RUNS_RE = re.compile(r"^(?:(?P<runs>\d+)\s+runs?|(?P<none>no run)|(?P<four>four)|(?P<six>six))\b", re.IGNORECASE)
+WIDES_RE = re.compile(r"^(?:(?P<wides>\d+)\s+)?wides?\b", re.IGNORECASE)
+BYES_RE = re.compile(r"^(?P<kind>leg byes?|byes?)\b", re.IGNORECASE)
+NO_BALL_RE = re.compile(r"^no[\s-]?ball\b", re.IGNORECASE)
+WICKET_RE = re.compile(
+    r"^out\s+(?P<how>caught|bowled|lbw|stumped|run out|hit wicket)(?:\s+by\s+(?P<fielder>[^!,(]+?))?\s*(?:!|,|\(|$)",
+    re.IGNORECASE)
+
+SILVER_DELIVERY_COLUMNS = (
+    "match_id", "innings_id", "seq", "over_number", "ball_in_over", "batting_team",
+    "batter_id", "batter_name", "bowler_id", "bowler_name", "runs_batter", "extras", "extra_type",
+    "total_runs", "is_legal", "is_four", "is_six", "is_wicket", "wicket_type", "fielder_name",
+    "dropped_by", "is_drop", "event_ts")
+
+
+def _int(value, default=None):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _runs(clause):
+    """(runs, boundary) of a clause such as "2 runs", "no run" or "FOUR"; boundary is 4, 6 or None"""
+    found = RUNS_RE.match(clause)
+    if not found:
+        return 0, None
+    if found.group("runs"):
+        return int(found.group("runs")), None
+    if found.group("four"):
+        return 4, 4
+    return (6, 6) if found.group("six") else (0, None)
+
+
+def parse_outcome(outcome):
+    """(runs_batter, boundary, extras, extra_type, wicket_type, fielder_name) of a delivery's outcome text"""
+    clauses = [clause.strip() for clause in outcome.split(",")]
+    first, second = clauses[0], clauses[1] if len(clauses) > 1 else ""
+    wicket = WICKET_RE.match(first)
+    if wicket:
+        fielder = wicket.group("fielder")
+        return 0, None, 0, None, wicket.group("how").lower(), fielder.strip() if fielder else None
+    if first.lower().startswith("out"):
+        return 0, None, 0, None, "other", None
+    wides = WIDES_RE.match(first)
+    if wides:
+        return 0, None, _int(wides.group("wides"), 1), "wide", None, None
+    if NO_BALL_RE.match(first):
+        runs, boundary = _runs(second)
+        return runs, boundary, 1, "noball", None, None
+    byes = BYES_RE.match(first)
+    if byes:
+        extra_type = "legbye" if byes.group("kind").lower().startswith("leg") else "bye"
+        return 0, None, _runs(second)[0], extra_type, None, None
+    runs, boundary = _runs(first)
+    return runs, boundary, 0, None, None, None
+
+
+def _over_and_ball(over_number):
+    """(over, ball) of Cricbuzz's over.ball notation, e.g. 12.4 -> (12, 4)"""
+    try:
+        over, _, ball = f"{float(over_number):.1f}".partition(".")
+    except (TypeError, ValueError):
+        return None
+    return int(over), int(ball)
+
+
+def build_delivery_rows(match_id, comm_data, normalize):
+    """silver_deliveries rows (SILVER_DELIVERY_COLUMNS order) for one commentary document.
+
+    `normalize` maps the batting team to its canonical name. Rows are numbered per
+    innings in bowling order (seq), whatever order the document lists them in.
+    """
+    deliveries = []
+    for entry in commentary_entries(comm_data):
+        over_ball = _over_and_ball(entry.get("overNumber", entry.get("overnum")))
+        text = entry.get("commText") or entry.get("commtxt") or ""
+        delivery = DELIVERY_RE.match(text)
+        if over_ball is None or not delivery:
+            continue
+        deliveries.append((_int(entry.get("timestamp"), 0), _int(entry.get("ballNbr"), 0), entry, over_ball, delivery))
+    deliveries.sort(key=lambda item: (item[0], item[1]))
+
+    rows, seq_by_innings = [], {}
+    for timestamp, _, entry, (over, ball), delivery in deliveries:
+        innings_id = _int(entry.get("inningsId", entry.get("inningsid")), 1)
+        seq_by_innings[innings_id] = seq = seq_by_innings.get(innings_id, 0) + 1
+        batter = entry.get("batsmanStriker") or {}
+        bowler = entry.get("bowlerStriker") or {}
+        event = str(entry.get("event") or "").upper()
+        text = delivery.string
+
+        runs_batter, boundary, extras, extra_type, wicket_type, fielder = parse_outcome(delivery.group("outcome"))
+        if boundary is None and runs_batter in (4, 6) and ("FOUR" if runs_batter == 4 else "SIX") in event:
+            boundary = runs_batter
+        if wicket_type is None and "WICKET" in event:
+            wicket_type = "other"
+        dropped_by = match_dropped_catch(text) if has_drop_keyword(text) else None
+        team = entry.get("batTeamName")
+        rows.append((
+            match_id, innings_id, seq, over, ball, (normalize(team) if team else "Unknown")[:100],
+            _int(batter.get("batId")) or None, (batter.get("batName") or delivery.group("batter"))[:100],
+            _int(bowler.get("bowlId")) or None, (bowler.get("bowlName") or delivery.group("bowler"))[:100],
+            runs_batter, extras, extra_type, runs_batter + extras, extra_type not in ("wide", "noball"),
+            boundary == 4, boundary == 6, wicket_type is not None, wicket_type,
+            (fielder or "")[:100] or None, (dropped_by or "")[:100] or None, dropped_by is not None, timestamp or None))
+    return rows
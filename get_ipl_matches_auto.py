@@ -1,7 +1,16 @@
+import argparse
+import hashlib
 import http.client
 import json
+import threading
+import time
 import boto3
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from rate_limiter import RateLimiter, QuotaExhaustedError
+from match_manifest import MatchManifest, PRECONDITION_FAILED_CODES, s3_error_code
+from json_storage import encode_json, decode_json
+from live_commentary import LIVE_STATES, entries_since, build_delta
 
 # -------- Your API and AWS Settings --------
 RAPIDAPI_HOST = "  "
@@ -13,6 +22,29 @@ AWS_SECRET_KEY = '  '
 AWS_REGION = '  '
 BUCKET_NAME = '  '
 
+# -------- Fetch Settings --------
+FETCH_WORKERS = 4     # Matches fetched in parallel, each worker keeps one keep-alive API connection
+UPLOAD_WORKERS = 4    # S3 uploads running alongside the API calls
+MANIFEST_COMMIT_EVERY = 1  # Matches recorded per conditional manifest write (1 = after every match)
+STORAGE_FORMAT = "pretty"  # "pretty" (indent=4), "compact", "gzip" or "zstd"; RawProcessor reads all of them
+
+# -------- Live Mode Settings --------
+LIVE_POLL_INTERVAL = 120      # Seconds between commentary polls of in-progress matches (one /comm call per live match)
+LIVE_SERIES_REFRESH = 10      # Re-read the series match list every N polls to pick up new/finished matches
+LIVE_DAILY_REQUEST_BUDGET = 300  # Live polling's own daily allowance, kept apart from the daily fetch's budget
+
+# -------- Rate Limit Settings --------
+API_RATE_PER_SEC = 5          # Token bucket refill rate
+API_BURST = 5                 # Token bucket size
+MAX_RETRIES = 4               # Retries for 429 / 5xx responses, with jittered exponential backoff
+DAILY_REQUEST_BUDGET = 500    # Requests this pipeline may spend per UTC day (set to your plan's quota)
+DAILY_BUDGET_RESERVE = 10     # Always left unspent so other jobs are never starved
+
+# S3 keys counting today's spend, one per budget
+BUDGET_KEY = "request_budget.json"
+LIVE_BUDGET_KEY = "live_request_budget.json"
+BUDGET_COMMIT_ATTEMPTS = 5
+
 # -------- Boto3 S3 Client --------
 s3 = boto3.client('s3',
                   aws_access_key_id=AWS_ACCESS_KEY,
@@ -20,17 +52,9 @@ s3 = boto3.client('s3',
                   region_name=AWS_REGION)
 
 # -------- Helper Functions --------
-def fetch_series_matches():
-    conn = http.client.HTTPSConnection(RAPIDAPI_HOST)
-    headers = {
-        'x-rapidapi-key': RAPIDAPI_KEY,
-        'x-rapidapi-host': RAPIDAPI_HOST
-    }
-
+def fetch_series_matches(connection_factory=None, limiter=None):
     endpoint = f"/series/v1/{SERIES_ID}"
-    conn.request("GET", endpoint, headers=headers)
-    res = conn.getresponse()
-    data = res.read()
+    data = _api_get(endpoint, connection_factory or _default_connection, limiter or RateLimiter())
 
     try:
         parsed = json.loads(data)
@@ -53,28 +77,185 @@ def get_completed_match_ids(match_details_list):
                 match_ids.append((match_info.get("matchId"), team1, team2))
     return match_ids
 
-def load_processed_matches():
+def get_live_match_ids(match_details_list):
+    match_ids = []
+    for group in match_details_list:
+        match_map = group.get("matchDetailsMap")
+        if not match_map:
+            continue
+        for match in match_map.get("match", []):
+            match_info = match.get("matchInfo", {})
+            if match_info.get("state", "") in LIVE_STATES:
+                team1 = match_info.get("team1", {}).get("teamName", "Team1")
+                team2 = match_info.get("team2", {}).get("teamName", "Team2")
+                match_ids.append((match_info.get("matchId"), team1, team2))
+    return match_ids
+
+def _read_request_usage(s3_client, key):
+    """(requests spent today (UTC), ETag of the usage object or None if there is none)"""
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     try:
-        obj = s3.get_object(Bucket=BUCKET_NAME, Key="processed_matches.json")
-        processed = json.loads(obj['Body'].read())
-        return processed
-    except Exception:
-        print("🔵 No processed_matches.json found, creating new.")
-        return []
+        obj = s3_client.get_object(Bucket=BUCKET_NAME, Key=key)
+    except Exception as e:
+        if s3_error_code(e) not in ('NoSuchKey', '404'):
+            print(f"⚠️ Could not read {key}, assuming nothing spent today: {e}")
+        return 0, None
+    usage = json.loads(obj['Body'].read())
+    return (usage.get("used", 0) if usage.get("date") == today else 0), obj.get('ETag')
+
+def load_request_usage(s3_client=None, key=BUDGET_KEY):
+    """Return the number of API requests already spent today (UTC)"""
+    return _read_request_usage(s3_client or s3, key)[0]
+
+def record_request_usage(spent, s3_client=None, key=BUDGET_KEY):
+    """Add `spent` requests to today's count and return the new total.
+
+    The write is conditional on the ETag just read (as in MatchManifest), so a run
+    that recorded its spend in between is re-read and added to, never overwritten.
+    """
+    s3_client = s3_client or s3
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    for _ in range(BUDGET_COMMIT_ATTEMPTS):
+        used, etag = _read_request_usage(s3_client, key)
+        condition = {'IfMatch': etag} if etag else {'IfNoneMatch': '*'}
+        try:
+            s3_client.put_object(
+                Bucket=BUCKET_NAME,
+                Key=key,
+                Body=json.dumps({"date": today, "used": used + spent}, indent=4),
+                ContentType='application/json',
+                **condition
+            )
+            return used + spent
+        except Exception as e:
+            if s3_error_code(e) not in PRECONDITION_FAILED_CODES:
+                raise
+    raise RuntimeError(f"Could not record request usage in {key} after {BUDGET_COMMIT_ATTEMPTS} attempts")
+
+# -------- Concurrent Fetching --------
+_worker_state = threading.local()
+# Every keep-alive connection a thread opened, so the fetch driver can close them when its pool is done
+_open_connections = set()
+_open_connections_lock = threading.Lock()
+
+def _default_connection():
+    return http.client.HTTPSConnection(RAPIDAPI_HOST)
+
+def close_api_connections():
+    """Close the keep-alive API connections of all threads (pool workers and the caller's own)"""
+    with _open_connections_lock:
+        connections = list(_open_connections)
+        _open_connections.clear()
+    for conn in connections:
+        conn.close()
+    _worker_state.conn = None
+
+def _send(endpoint, connection_factory):
+    """GET over this worker's keep-alive connection, returning (status, headers, body)"""
+    headers = {'x-rapidapi-key': RAPIDAPI_KEY, 'x-rapidapi-host': RAPIDAPI_HOST}
+    for attempt in range(2):
+        conn = getattr(_worker_state, "conn", None)
+        if conn is None:
+            conn = connection_factory()
+            _worker_state.conn = conn
+            with _open_connections_lock:
+                _open_connections.add(conn)
+        try:
+            conn.request("GET", endpoint, headers=headers)
+            res = conn.getresponse()
+            return res.status, dict(res.getheaders()), res.read()
+        except (http.client.HTTPException, OSError):
+            # Server closed the idle keep-alive connection, reconnect once
+            conn.close()
+            _worker_state.conn = None
+            with _open_connections_lock:
+                _open_connections.discard(conn)
+            if attempt == 1:
+                raise
+
+def _api_get(endpoint, connection_factory, limiter):
+    """GET an API endpoint through the rate limiter, retrying 429/5xx, and return the body bytes"""
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        status, headers = None, {}
+        try:
+            status, headers, body = _send(endpoint, connection_factory)
+        finally:
+            limiter.release(status, headers)
+
+        if status == 429 and b"quota" in body.lower():
+            limiter.mark_exhausted()
+            raise QuotaExhaustedError(f"Provider quota exhausted on {endpoint}")
+        if (status == 429 or status >= 500) and attempt < MAX_RETRIES:
+            retry_after = {k.lower(): v for k, v in headers.items()}.get("retry-after")
+            limiter.backoff(attempt, retry_after)
+            continue
+        if status >= 400:
+            raise http.client.HTTPException(f"HTTP {status} for {endpoint}")
+        return body
 
-def save_processed_matches(processed_ids):
-    s3.put_object(
+def _upload_json(s3_client, key, data):
+    """Upload `data` as JSON and return the SHA-256 of the stored bytes"""
+    body, encoding_kwargs = encode_json(data, STORAGE_FORMAT)
+    s3_client.put_object(
         Bucket=BUCKET_NAME,
-        Key="processed_matches.json",
-        Body=json.dumps(processed_ids, indent=4),
-        ContentType='application/json'
+        Key=key,
+        Body=body,
+        ContentType='application/json',
+        **encoding_kwargs
     )
+    print(f"✅ Uploaded {key.split('/')[-1]} to S3")
+    return hashlib.sha256(body).hexdigest()
+
+def _match_folder(match_id, team1, team2):
+    return f"{match_id}_{team1.replace(' ', '')}_vs_{team2.replace(' ', '')}"
+
+def _fetch_match(match_id, team1, team2, connection_factory, s3_client, upload_pool, limiter, manifest):
+    """Fetch scorecard and commentary for one match; uploads overlap with the next API call"""
+    match_folder = _match_folder(match_id, team1, team2)
+
+    scard_data = json.loads(_api_get(f"/mcenter/v1/{match_id}/scard", connection_factory, limiter).decode("utf-8"))
+    scard_upload = upload_pool.submit(_upload_json, s3_client, f"{match_folder}/{match_folder}_scard.json", scard_data)
+
+    comm_data = json.loads(_api_get(f"/mcenter/v1/{match_id}/comm", connection_factory, limiter).decode("utf-8"))
+    comm_upload = upload_pool.submit(_upload_json, s3_client, f"{match_folder}/{match_folder}_comm.json", comm_data)
+
+    manifest.mark_complete(match_id, scard_upload.result(), comm_upload.result())
+    return str(match_id)
 
 # -------- Main Script --------
 
-def get_ipl_matches():
+def get_ipl_matches(max_workers=None, connection_factory=None, s3_client=None, limiter=None):
+    """Fetch new completed matches with up to `max_workers` in flight.
+
+    `connection_factory` and `s3_client` default to the RapidAPI HTTPS host and the
+    module S3 client; pass local stand-ins to run against a test HTTP server and S3.
+    API calls go through `limiter`, which by default is sized from the rate limit
+    settings and today's remaining request budget.
+    """
+    max_workers = max_workers or FETCH_WORKERS
+    connection_factory = connection_factory or _default_connection
+    s3_client = s3_client or s3
+    used_today = load_request_usage(s3_client)
+    limiter = limiter or RateLimiter(
+        rate_per_sec=API_RATE_PER_SEC, burst=API_BURST, max_concurrency=max_workers,
+        daily_budget=max(0, DAILY_REQUEST_BUDGET - used_today), budget_reserve=DAILY_BUDGET_RESERVE
+    )
+
+    try:
+        _fetch_new_matches(max_workers, connection_factory, s3_client, limiter)
+    finally:
+        close_api_connections()
+        record_request_usage(limiter.stats['requests'], s3_client)
+        print(limiter.report())
+
+def _fetch_new_matches(max_workers, connection_factory, s3_client, limiter):
     print("\n🔵 Fetching list of completed matches from IPL series...")
-    match_details = fetch_series_matches()
+    try:
+        match_details = fetch_series_matches(connection_factory, limiter)
+    except QuotaExhaustedError as e:
+        print(f"⛔ {e}, skipping this run.")
+        return
 
     if not match_details:
         print("⚠️ No matches found, exiting.")
@@ -83,52 +264,142 @@ def get_ipl_matches():
     completed_matches = get_completed_match_ids(match_details)
     print(f"✅ Found {len(completed_matches)} completed matches.")
 
-    processed_matches = load_processed_matches()
-    new_matches = [match for match in completed_matches if str(match[0]) not in processed_matches]
+    manifest = MatchManifest(s3_client, BUCKET_NAME, commit_every=MANIFEST_COMMIT_EVERY)
+    new_matches = [match for match in completed_matches if not manifest.is_complete(match[0])]
 
-    print(f"🟡 {len(new_matches)} new matches to process.")
+    print(f"🟡 {len(new_matches)} new matches to process with {max_workers} workers.")
 
-    for match_id, team1, team2 in new_matches:
-        try:
-            match_folder = f"{match_id}_{team1.replace(' ', '')}_vs_{team2.replace(' ', '')}"
+    try:
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as upload_pool, \
+             ThreadPoolExecutor(max_workers=max_workers) as fetch_pool:
+            futures = {
+                fetch_pool.submit(_fetch_match, match_id, team1, team2, connection_factory, s3_client, upload_pool, limiter, manifest): match_id
+                for match_id, team1, team2 in new_matches
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except QuotaExhaustedError:
+                    print(f"⛔ Request budget exhausted, match {futures[future]} deferred to the next run")
+                except Exception as e:
+                    print(f"❌ Error processing match {futures[future]}: {e}")
+                    manifest.mark_failed(futures[future], e)
+    finally:
+        manifest.commit()
+    print("\n🎯 All new matches processed and uploaded!")
 
-            # Fetch Scorecard
-            conn = http.client.HTTPSConnection(RAPIDAPI_HOST)
-            headers = {'x-rapidapi-key': RAPIDAPI_KEY, 'x-rapidapi-host': RAPIDAPI_HOST}
-            conn.request("GET", f"/mcenter/v1/{match_id}/scard", headers=headers)
-            res = conn.getresponse()
-            scard_data = json.loads(res.read().decode("utf-8"))
+# -------- Live Mode --------
+# Live polling cuts S3 writes, not API calls: the API has no since-timestamp or paginated
+# /comm, so every poll downloads the full commentary of each live match (one request) and
+# only the entries newer than the last seen ball are uploaded, as a delta object.
 
-            s3.put_object(
-                Bucket=BUCKET_NAME,
-                Key=f"{match_folder}/{match_folder}_scard.json",
-                Body=json.dumps(scard_data, indent=4),
-                ContentType='application/json'
-            )
-            print(f"✅ Uploaded {match_folder}_scard.json to S3")
+def _load_live_state(s3_client, match_folder):
+    """{"last_timestamp", "seq"} of a match's deltas so far; a fresh state only if none was saved"""
+    try:
+        obj = s3_client.get_object(Bucket=BUCKET_NAME, Key=f"{match_folder}/live/state.json")
+    except Exception as e:
+        if s3_error_code(e) in ('NoSuchKey', '404'):
+            return {"last_timestamp": 0, "seq": 0}
+        raise
+    return json.loads(obj['Body'].read())
 
-            # Fetch Commentary
-            conn = http.client.HTTPSConnection(RAPIDAPI_HOST)
-            conn.request("GET", f"/mcenter/v1/{match_id}/comm", headers=headers)
-            res = conn.getresponse()
-            comm_data = json.loads(res.read().decode("utf-8"))
+def _poll_match(match_id, team1, team2, state, connection_factory, s3_client, limiter):
+    """Upload commentary entries newer than the last seen ball as one delta object; return bytes written.
 
-            s3.put_object(
-                Bucket=BUCKET_NAME,
-                Key=f"{match_folder}/{match_folder}_comm.json",
-                Body=json.dumps(comm_data, indent=4),
-                ContentType='application/json'
-            )
-            print(f"✅ Uploaded {match_folder}_comm.json to S3")
+    The API has no since-timestamp variant of /comm, so each poll is still one full
+    /comm request; only the entries not seen before are written to S3. Deltas are never
+    overwritten: if another run already wrote this sequence number, the saved state is
+    reloaded and the entries are picked up from there on the next poll.
+    """
+    match_folder = _match_folder(match_id, team1, team2)
+    comm_data = decode_json(_api_get(f"/mcenter/v1/{match_id}/comm", connection_factory, limiter))
+    new_entries = entries_since(comm_data, state["last_timestamp"])
+    if not new_entries:
+        return 0
 
-            # Update processed list
-            processed_matches.append(str(match_id))
+    delta = build_delta(match_id, state["seq"] + 1, state["last_timestamp"], new_entries)
+    body, encoding_kwargs = encode_json(delta, STORAGE_FORMAT)
+    try:
+        s3_client.put_object(
+            Bucket=BUCKET_NAME,
+            Key=f"{match_folder}/live/{match_folder}_comm_delta_{delta['seq']:05d}.json",
+            Body=body,
+            ContentType='application/json',
+            IfNoneMatch='*',
+            **encoding_kwargs
+        )
+    except Exception as e:
+        if s3_error_code(e) not in PRECONDITION_FAILED_CODES:
+            raise
+        print(f"⚠️ {match_folder}: delta #{delta['seq']} already exists, reloading live state")
+        state.clear()
+        state.update(_load_live_state(s3_client, match_folder))
+        return 0
+    state.update(last_timestamp=delta["to_timestamp"], seq=delta["seq"])
+    s3_client.put_object(
+        Bucket=BUCKET_NAME,
+        Key=f"{match_folder}/live/state.json",
+        Body=json.dumps(state, indent=4),
+        ContentType='application/json'
+    )
+    print(f"📡 {match_folder}: {len(new_entries)} new entries, delta #{delta['seq']} ({len(body):,} bytes)")
+    return len(body)
 
-        except Exception as e:
-            print(f"❌ Error processing match {match_id}: {e}")
+def poll_live_matches(poll_interval=None, max_polls=None, connection_factory=None, s3_client=None, limiter=None):
+    """Poll in-progress matches and append commentary deltas until none are live (or `max_polls` is hit).
 
-    save_processed_matches(processed_matches)
-    print("\n🎯 All new matches processed and uploaded!")
+    Deltas land under {match_folder}/live/ next to the final scorecard/commentary for
+    near-real-time consumers; RAW is still loaded from the full commentary the daily
+    fetch stores once the match is complete. Requests are counted against
+    LIVE_DAILY_REQUEST_BUDGET, separately from the daily fetch.
+    """
+    poll_interval = LIVE_POLL_INTERVAL if poll_interval is None else poll_interval
+    connection_factory = connection_factory or _default_connection
+    s3_client = s3_client or s3
+    used_today = load_request_usage(s3_client, LIVE_BUDGET_KEY)
+    limiter = limiter or RateLimiter(
+        rate_per_sec=API_RATE_PER_SEC, burst=API_BURST, max_concurrency=1,
+        daily_budget=max(0, LIVE_DAILY_REQUEST_BUDGET - used_today), budget_reserve=DAILY_BUDGET_RESERVE
+    )
+
+    live_matches, states = [], {}
+    polls, bytes_written = 0, 0
+    try:
+        while max_polls is None or polls < max_polls:
+            if polls % LIVE_SERIES_REFRESH == 0:
+                live_matches = get_live_match_ids(fetch_series_matches(connection_factory, limiter))
+                if not live_matches:
+                    print("⚪ No live matches right now.")
+                    break
+            for match_id, team1, team2 in live_matches:
+                try:
+                    if match_id not in states:
+                        states[match_id] = _load_live_state(s3_client, _match_folder(match_id, team1, team2))
+                    state = states[match_id]
+                    bytes_written += _poll_match(match_id, team1, team2, state, connection_factory, s3_client, limiter)
+                except QuotaExhaustedError:
+                    raise
+                except Exception as e:
+                    print(f"❌ Error polling live match {match_id}: {e}")
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                time.sleep(poll_interval)
+    except QuotaExhaustedError as e:
+        print(f"⛔ {e}, stopping live polling.")
+    finally:
+        close_api_connections()
+        record_request_usage(limiter.stats['requests'], s3_client, LIVE_BUDGET_KEY)
+        print(f"📡 Live mode: {polls} polls, {limiter.stats['requests']} API requests "
+              f"(full /comm payloads, no incremental endpoint), {bytes_written:,} delta bytes written")
+        print(limiter.report())
 
 if __name__ == "__main__":
-    get_ipl_matches()
+    parser = argparse.ArgumentParser(description="Fetch IPL match data into S3")
+    parser.add_argument("--live", action="store_true", help="poll in-progress matches and upload commentary deltas "
+                        "(each poll still downloads the full /comm; only S3 writes are incremental)")
+    parser.add_argument("--max-polls", type=int, default=None)
+    args = parser.parse_args()
+    if args.live:
+        poll_live_matches(max_polls=args.max_polls)
+    else:
+        get_ipl_matches()
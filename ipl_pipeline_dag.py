@@ -3,7 +3,7 @@ from airflow import DAG
 from airflow.operators.python_operator import PythonOperator
 from airflow.utils.dates import days_ago
 from datetime import timedelta
-from get_ipl_matches_auto import get_ipl_matches
+from get_ipl_matches_auto import get_ipl_matches, poll_live_matches
 from main_pipeline import run_full_pipeline
 from update_mysql_tables import update_mysql_tables
 from airflow_refresh import refresh_superset_charts
@@ -56,3 +56,24 @@ t4 = PythonOperator(
 
 # Add task dependencies at the end
 t1 >> t2 >> t3 >> t4
+
+# Live commentary deltas, only during IPL match windows: the 15:30 and 19:30 IST starts are
+# 10:00 and 14:00 UTC and a match runs ~4 hours. Each run polls for ~8 minutes (4 polls x 120s)
+# so runs don't overlap: about 1 series + 4 /comm calls per live match every 10 minutes,
+# drawn from LIVE_DAILY_REQUEST_BUDGET rather than the daily fetch's budget
+live_dag = DAG(
+    'ipl_live_commentary_dag',
+    default_args = default_args,
+    description = 'Poll in-progress IPL matches for commentary deltas',
+    schedule_interval='*/10 10-17 * * *',
+    catchup=False,
+    tags=['IPL', 'cricket', 'live'],
+    max_active_runs=1
+)
+
+live_poll = PythonOperator(
+    task_id = 'poll_live_commentary',
+    python_callable = poll_live_matches,
+    op_kwargs = {'max_polls': 4},
+    dag = live_dag,
+)
@@ -0,0 +1,109 @@
+# json_storage.py
+import gzip
+import json
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+# "pretty" is the original indent=4 layout and stays the default
+STORAGE_FORMATS = ("pretty", "compact", "gzip", "zstd")
+
+# How RawProcessor keeps documents in MySQL: the JSON column, or compressed bytes in a BLOB
+RAW_PAYLOAD_FORMATS = ("json", "zlib", "zstd")
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def encode_json(data, storage_format="pretty"):
+    """Serialize `data` for S3, returning (body_bytes, extra put_object kwargs)"""
+    if storage_format == "pretty":
+        return json.dumps(data, indent=4).encode("utf-8"), {}
+
+    compact = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if storage_format == "compact":
+        return compact, {}
+    if storage_format == "gzip":
+        return gzip.compress(compact, compresslevel=6), {'ContentEncoding': 'gzip'}
+    if storage_format == "zstd":
+        if zstandard is None:
+            raise ValueError("storage_format 'zstd' requires the zstandard package")
+        return zstandard.ZstdCompressor(level=10).compress(compact), {'ContentEncoding': 'zstd'}
+    raise ValueError(f"Unknown storage format '{storage_format}', expected one of {STORAGE_FORMATS}")
+
+
+def decompress_json_bytes(body, content_encoding=None):
+    """Return the plain JSON bytes of a stored object, whatever format it was written in.
+
+    The format is taken from the magic bytes, so objects uploaded without
+    Content-Encoding metadata (or before compression existed) still decode.
+    """
+    if body[:2] == GZIP_MAGIC or content_encoding == "gzip":
+        return gzip.decompress(body)
+    if body[:4] == ZSTD_MAGIC or content_encoding == "zstd":
+        if zstandard is None:
+            raise ValueError("Object is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    if content_encoding == "zlib":
+        return zlib.decompress(body)
+    return body
+
+
+def decode_json(body, content_encoding=None):
+    return json.loads(decompress_json_bytes(body, content_encoding).decode("utf-8"))
+
+
+def read_json_text(body, content_encoding=None):
+    """Return a stored object as JSON text without parsing it.
+
+    Only a structural sanity check is done here (a top-level object/array); full
+    validation is left to MySQL's JSON column on insert.
+    """
+    text = decompress_json_bytes(body, content_encoding).decode("utf-8-sig").strip()
+    if not text or (text[0], text[-1]) not in (("{", "}"), ("[", "]")):
+        raise ValueError("Object is not a JSON document")
+    return text
+
+
+def compress_payload(text, payload_format):
+    """Compress JSON text for a RAW BLOB column ("zlib" or "zstd")"""
+    data = text.encode("utf-8")
+    if payload_format == "zlib":
+        return zlib.compress(data, 6)
+    if payload_format == "zstd":
+        if zstandard is None:
+            raise ValueError("payload format 'zstd' requires the zstandard package")
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    raise ValueError(f"Unknown payload format '{payload_format}', expected one of {RAW_PAYLOAD_FORMATS[1:]}")
+
+
+def scorecard_hot_fields(scorecard):
+    """The fields behind raw_scorecard's generated columns, at the same JSON paths.
+
+    Missing values are left out rather than stored as JSON null, which ->> would turn into 'null'.
+    """
+    header = scorecard.get('matchHeader') or {}
+    innings = scorecard.get('scoreCard')
+    if innings is None:
+        innings = scorecard.get('scorecard') or []
+    hot_header = {}
+    for team_key in ('team1', 'team2'):
+        name = (header.get(team_key) or {}).get('name')
+        if name is not None:
+            hot_header[team_key] = {'name': name}
+    if header.get('matchStartTimestamp') is not None:
+        hot_header['matchStartTimestamp'] = header['matchStartTimestamp']
+    hot = {'matchHeader': hot_header, 'inningsCount': len(innings)}
+    if scorecard.get('status') is not None:
+        hot['status'] = scorecard['status']
+    return hot
+
+
+def decode_raw_json(json_data, payload=None, payload_encoding=None):
+    """Parse a RAW row stored either way: the JSON column, or else the compressed payload"""
+    if json_data is not None:
+        return json.loads(json_data)
+    return decode_json(bytes(payload), payload_encoding)
@@ -0,0 +1,64 @@
+# live_commentary.py
+"""Helpers for incremental commentary deltas written by the fetcher's live mode.
+
+A delta object holds only the commentary entries newer than the previous poll:
+    {"match_id", "seq", "from_timestamp", "to_timestamp", "commentaryList": [...]}
+`merge_commentary_deltas` folds a series of deltas (optionally on top of a full /comm
+document) back into one document with the usual newest-first commentaryList.
+"""
+
+# matchInfo.state values of matches worth polling
+LIVE_STATES = {"In Progress", "Innings Break", "Toss", "Rain", "Delay", "Stumps"}
+
+
+def commentary_entries(comm_data):
+    """Return the commentary entries of a /comm payload in either API layout"""
+    if not isinstance(comm_data, dict):
+        return []
+    if isinstance(comm_data.get("commentaryList"), list):
+        return comm_data["commentaryList"]
+    return [wrapper["commentary"] for wrapper in comm_data.get("comwrapper", [])
+            if isinstance(wrapper, dict) and isinstance(wrapper.get("commentary"), dict)]
+
+
+def _timestamp(entry):
+    try:
+        return int(entry.get("timestamp") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _entry_key(entry):
+    return (_timestamp(entry), entry.get("commText") or entry.get("commtxt"))
+
+
+def entries_since(comm_data, last_timestamp):
+    """Entries strictly newer than `last_timestamp`, newest first"""
+    new_entries = [e for e in commentary_entries(comm_data) if _timestamp(e) > (last_timestamp or 0)]
+    return sorted(new_entries, key=_timestamp, reverse=True)
+
+
+def build_delta(match_id, seq, last_timestamp, new_entries):
+    return {
+        "match_id": str(match_id),
+        "seq": seq,
+        "from_timestamp": last_timestamp,
+        "to_timestamp": max(_timestamp(e) for e in new_entries),
+        "commentaryList": new_entries
+    }
+
+
+def merge_commentary_deltas(deltas, base=None):
+    """Merge delta objects (any order, duplicates allowed) into a full commentary document"""
+    merged = dict(base or {})
+    entries = list(commentary_entries(base)) if base else []
+    seen = {_entry_key(e) for e in entries}
+    for delta in sorted(deltas, key=lambda d: d.get("seq", 0)):
+        for entry in delta.get("commentaryList", []):
+            key = _entry_key(entry)
+            if key not in seen:
+                seen.add(key)
+                entries.append(entry)
+    merged.pop("comwrapper", None)
+    merged["commentaryList"] = sorted(entries, key=_timestamp, reverse=True)
+    return merged
@@ -1,8 +1,10 @@
 # main_pipeline.py
 from datetime import datetime
 from raw_processor import RawProcessor
+from raw_sources import open_source
 from transform_processor import TransformProcessor
 from custom_stats_processor import CustomStatsProcessor
+from team_names import default_resolver
 from airflow.exceptions import AirflowException
 from airflow.utils.log.logging_mixin import LoggingMixin
 import logging
@@ -23,6 +25,17 @@ AWS_CONFIG = {
 
 BUCKET_NAME = '  ' # Add your S3 bucket name
 
+# Local directory tree or .iplpack archive to load RAW from instead of S3 (offline replays)
+RAW_SOURCE_PATH = None
+# How RAW documents are kept in MySQL: "json" (JSON column), or "zlib"/"zstd" compressed BLOBs
+RAW_PAYLOAD_FORMAT = "json"
+# True clears SILVER and re-transforms every match; False only handles new/changed RAW rows
+SILVER_FULL_REBUILD = False
+# Processes parsing scorecards in the SILVER transform (1 = serial)
+SILVER_PARSE_WORKERS = 1
+# Points table engine: "python" (per-match reference loop) or "numpy" (vectorized, needs numpy)
+GOLD_STANDINGS_ENGINE = "python"
+
 def run_full_pipeline(**kwargs):
     """Execute the complete IPL Data Pipeline"""
     logging.info(f"\n🏏 IPL Data Pipeline - Started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -35,8 +48,11 @@ def run_full_pipeline(**kwargs):
     try:
         # Initialize Processors
         logging.info("Initializing processors...")
-        raw_processor_instance = RawProcessor(aws_config=AWS_CONFIG, mysql_config=MYSQL_CONFIG, bucket_name=BUCKET_NAME)
-        transform_processor_instance = TransformProcessor(mysql_config=MYSQL_CONFIG)
+        raw_source = open_source(RAW_SOURCE_PATH) if RAW_SOURCE_PATH else None
+        raw_processor_instance = RawProcessor(aws_config=AWS_CONFIG, mysql_config=MYSQL_CONFIG, bucket_name=BUCKET_NAME,
+                                              source=raw_source, payload_format=RAW_PAYLOAD_FORMAT)
+        transform_processor_instance = TransformProcessor(mysql_config=MYSQL_CONFIG, parse_workers=SILVER_PARSE_WORKERS,
+                                                          standings_engine=GOLD_STANDINGS_ENGINE)
         custom_stats_processor_instance = CustomStatsProcessor(mysql_config=MYSQL_CONFIG)
         logging.info("Processors initialized.")
 
@@ -60,11 +76,14 @@ def run_full_pipeline(**kwargs):
                 return
             else:
                 logging.info(f"\nℹ️ No new data loaded from S3, but {raw_data_exists_count} existing RAW records found. Proceeding with transformations.")
+        elif raw_processor_instance.changed_match_ids:
+            logging.info(f"Changed matches this run: {', '.join(sorted(raw_processor_instance.changed_match_ids))}")
         logging.info("--- S3 to RAW loading complete ---")
 
         # Step 3: Transform data from RAW to SILVER
         logging.info("\n--- Step 3: Transforming RAW data to SILVER ---")
-        processed_to_silver_count = transform_processor_instance.transform_raw_to_silver()
+        processed_to_silver_count = transform_processor_instance.transform_raw_to_silver(
+            full_rebuild=kwargs.get('full_rebuild', SILVER_FULL_REBUILD))
         if processed_to_silver_count == 0:
             logging.info("\n⚠️ No data was transformed to SILVER layer. GOLD layer transformation will be skipped.")
             cursor = transform_processor_instance.connection.cursor()
@@ -78,6 +97,12 @@ def run_full_pipeline(**kwargs):
                 logging.info(f"ℹ️ No new data processed to SILVER, but {silver_data_exists_count} existing SILVER records found. Proceeding with GOLD.")
 
         logging.info("--- RAW to SILVER transformation complete ---")
+
+        # Step 3b: Ball-by-ball facts from RAW commentary
+        logging.info("\n--- Step 3b: Transforming RAW commentary to silver_deliveries ---")
+        transform_processor_instance.transform_commentary_to_silver(
+            full_rebuild=kwargs.get('full_rebuild', SILVER_FULL_REBUILD))
+        logging.info("--- RAW commentary to silver_deliveries complete ---")
         
         # Step 4: Transform data from SILVER to GOLD
         logging.info("\n--- Step 4: Transforming SILVER data to GOLD ---")
@@ -88,6 +113,7 @@ def run_full_pipeline(**kwargs):
         logging.info("\n--- Step 5: Calculating and loading Custom GOLD Statistics ---")
         custom_stats_processor_instance.run_all_custom_stats() # New
         logging.info("--- Custom GOLD Statistics transformation complete ---")
+        logging.info(default_resolver.report())
 
         logging.info("\n🎉 Pipeline execution completed successfully! 🎉")
 
@@ -0,0 +1,124 @@
+# match_manifest.py
+import json
+import threading
+from datetime import datetime, timezone
+
+STATUS_COMPLETE = "complete"
+STATUS_FAILED = "failed"
+
+LEGACY_KEY = "processed_matches.json"
+
+
+# S3 error codes of a conditional put that lost the race to another writer
+PRECONDITION_FAILED_CODES = ('PreconditionFailed', 'ConditionalRequestConflict', '412')
+
+
+def s3_error_code(e):
+    return (getattr(e, 'response', None) or {}).get('Error', {}).get('Code')
+
+
+class MatchManifest:
+    """Per-match fetch progress stored as one JSON object in S3.
+
+    Entries are keyed by match id: {"status", "scard_sha256", "comm_sha256", "fetched_at"}.
+    Updates are committed every `commit_every` changes with a conditional put (If-Match on
+    the ETag we last saw), so a concurrent run that committed first is merged in rather
+    than overwritten. The first load migrates the old processed_matches.json id list.
+    """
+
+    def __init__(self, s3_client, bucket_name, key="match_manifest.json", commit_every=1, max_commit_attempts=5):
+        self.s3 = s3_client
+        self.bucket_name = bucket_name
+        self.key = key
+        self.commit_every = commit_every
+        self.max_commit_attempts = max_commit_attempts
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._entries, self._etag = self._fetch()
+        if self._etag is None and not self._entries:
+            self._entries = self._load_legacy()
+
+    def _fetch(self):
+        try:
+            obj = self.s3.get_object(Bucket=self.bucket_name, Key=self.key)
+            return json.loads(obj['Body'].read()), obj.get('ETag')
+        except Exception as e:
+            if s3_error_code(e) not in ('NoSuchKey', '404'):
+                print(f"⚠️ Could not read {self.key}, starting empty: {e}")
+            return {}, None
+
+    def _load_legacy(self):
+        try:
+            obj = self.s3.get_object(Bucket=self.bucket_name, Key=LEGACY_KEY)
+            legacy_ids = json.loads(obj['Body'].read())
+        except Exception:
+            print(f"🔵 No {self.key} found, creating new.")
+            return {}
+        print(f"🔵 Migrating {len(legacy_ids)} ids from {LEGACY_KEY} into {self.key}")
+        return {str(match_id): {"status": STATUS_COMPLETE} for match_id in legacy_ids}
+
+    def is_complete(self, match_id):
+        entry = self._entries.get(str(match_id))
+        return entry is not None and entry.get("status") == STATUS_COMPLETE
+
+    def get(self, match_id):
+        return self._entries.get(str(match_id))
+
+    def mark_complete(self, match_id, scard_sha256=None, comm_sha256=None):
+        self._record(match_id, {
+            "status": STATUS_COMPLETE,
+            "scard_sha256": scard_sha256,
+            "comm_sha256": comm_sha256,
+            "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
+        })
+
+    def mark_failed(self, match_id, error):
+        previous = self.get(match_id)
+        if previous and previous.get("status") == STATUS_COMPLETE:
+            return
+        self._record(match_id, {
+            "status": STATUS_FAILED,
+            "error": str(error)[:500],
+            "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
+        })
+
+    def _record(self, match_id, entry):
+        with self._lock:
+            self._entries[str(match_id)] = entry
+            self._pending.add(str(match_id))
+            if len(self._pending) >= self.commit_every:
+                self._commit_locked()
+
+    def commit(self):
+        with self._lock:
+            self._commit_locked()
+
+    def _commit_locked(self):
+        if not self._pending:
+            return
+        for _ in range(self.max_commit_attempts):
+            condition = {'IfMatch': self._etag} if self._etag else {'IfNoneMatch': '*'}
+            try:
+                res = self.s3.put_object(
+                    Bucket=self.bucket_name,
+                    Key=self.key,
+                    Body=json.dumps(self._entries, indent=4),
+                    ContentType='application/json',
+                    **condition
+                )
+                self._etag = res.get('ETag')
+                self._pending.clear()
+                return
+            except Exception as e:
+                if s3_error_code(e) not in PRECONDITION_FAILED_CODES:
+                    raise
+                # Another run committed first: take its entries, re-apply ours, retry
+                remote, self._etag = self._fetch()
+                for match_id in self._pending:
+                    ours = self._entries[match_id]
+                    theirs = remote.get(match_id)
+                    if ours.get("status") == STATUS_FAILED and theirs and theirs.get("status") == STATUS_COMPLETE:
+                        continue
+                    remote[match_id] = ours
+                self._entries = remote
+        raise RuntimeError(f"Could not commit {self.key} after {self.max_commit_attempts} attempts")
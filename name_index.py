@@ -0,0 +1,52 @@
+# name_index.py
+"""Fuzzy player-name lookup against one match's name_to_id_map.
+
+The stats code picks the known name with the highest fuzz.ratio and accepts it above a
+threshold. NameIndex gives the same answer while scoring only keys that can reach that
+threshold. fuzz.ratio is 2*M/(len(a)+len(b)) with M matched characters, and M is at
+most the characters the two names share (as multisets). Keys are bucketed by length
+and carry their character counts, so whole length buckets and then single keys are
+ruled out with that bound before any Levenshtein/difflib call. Exact keys are a hash hit.
+"""
+from collections import Counter
+
+from fuzzywuzzy import fuzz
+
+
+def _ratio_bound(shared, total_length):
+    """Highest fuzz.ratio two strings of `total_length` characters sharing `shared` can score"""
+    return int(round(200.0 * shared / total_length)) if total_length else 0
+
+
+class NameIndex:
+    """Best fuzz.ratio match among the keys of a {lowercase name: player_id} map"""
+
+    def __init__(self, name_to_id_map):
+        self.name_to_id_map = name_to_id_map
+        self._by_length = {}
+        for position, key in enumerate(name_to_id_map):
+            self._by_length.setdefault(len(key), []).append((position, key, Counter(key)))
+        self.stats = {'lookups': 0, 'scored': 0}
+
+    def best_match(self, name_lower, min_score):
+        """(score, key) of the first key in map order with the highest fuzz.ratio against
+        `name_lower`, or (0, None) when no key scores `min_score` or more"""
+        self.stats['lookups'] += 1
+        # An exact key scores 100, and below ~100 characters no other key rounds up to 100
+        if name_lower in self.name_to_id_map and len(name_lower) < 100:
+            return 100, name_lower
+        counts = Counter(name_lower)
+        candidates = []
+        for length, keys in self._by_length.items():
+            if _ratio_bound(min(length, len(name_lower)), length + len(name_lower)) < min_score:
+                continue
+            for position, key, key_counts in keys:
+                if _ratio_bound(sum((counts & key_counts).values()), length + len(name_lower)) >= min_score:
+                    candidates.append((position, key))
+        best_score, best_key = 0, None
+        for _, key in sorted(candidates):
+            score = fuzz.ratio(name_lower, key)
+            self.stats['scored'] += 1
+            if score > best_score:
+                best_score, best_key = score, key
+        return (best_score, best_key) if best_score >= min_score else (0, None)
@@ -0,0 +1,240 @@
+# player_maps.py
+"""Per-match player maps: who played, under which name, for which team.
+
+`build_player_map` resolves both teams (matchHeader, then matchTeamInfo, then the
+innings) and reconciles player names across the batting and bowling lists of either
+scorecard layout. The SILVER transform stores its result in silver_match_players once
+per match; `player_map_rows` / `player_map_from_rows` convert to and from those rows
+keeping iteration order, so readers get exactly the maps a rebuild would give.
+"""
+import json
+
+# Largest value of the INT player_id column
+MAX_PLAYER_ID = 2 ** 31 - 1
+
+
+def get_innings_list(scorecard_json):
+    if not scorecard_json: return []
+    innings_list = scorecard_json.get('scoreCard')
+    if innings_list is None: innings_list = scorecard_json.get('scorecard')
+    return innings_list if isinstance(innings_list, list) else []
+
+
+def build_player_map(scorecard_json, normalize, log=None, match_id_for_log="UnknownMatch"):
+    """({player_id: {'name', 'team_name_normalized'}}, {lowercase name: player_id}) for one scorecard.
+
+    `normalize` maps a raw team name to its canonical name or "Unknown".
+    """
+    player_map = {}
+    name_to_id_map = {}
+    if not scorecard_json: return player_map, name_to_id_map
+
+    match_header = scorecard_json.get("matchHeader", {}) 
+    
+    effective_team1_name_norm = "Unknown"
+    effective_team2_name_norm = "Unknown"
+
+    if match_header:
+        team1_info_mh = match_header.get("team1", {})
+        team2_info_mh = match_header.get("team2", {})
+        if team1_info_mh and isinstance(team1_info_mh, dict) and team1_info_mh.get("name"):
+            effective_team1_name_norm = normalize(team1_info_mh.get("name"))
+        if team2_info_mh and isinstance(team2_info_mh, dict) and team2_info_mh.get("name"):
+            candidate_t2_norm = normalize(team2_info_mh.get("name"))
+            if candidate_t2_norm != "Unknown" and candidate_t2_norm != effective_team1_name_norm:
+                effective_team2_name_norm = candidate_t2_norm
+            elif candidate_t2_norm != "Unknown" and effective_team1_name_norm == "Unknown": 
+                effective_team1_name_norm = candidate_t2_norm
+
+        if (effective_team1_name_norm == "Unknown" or effective_team2_name_norm == "Unknown" or effective_team1_name_norm == effective_team2_name_norm):
+            mti_list = match_header.get("matchTeamInfo")
+            if isinstance(mti_list, list) and len(mti_list) > 0:
+                current_teams_found = []
+                if effective_team1_name_norm != "Unknown": current_teams_found.append(effective_team1_name_norm)
+                if effective_team2_name_norm != "Unknown" and effective_team2_name_norm not in current_teams_found: current_teams_found.append(effective_team2_name_norm)
+
+                for team_info_mti in mti_list:
+                    if len(current_teams_found) == 2: break
+                    if isinstance(team_info_mti, dict):
+                        team_name_raw_mti = team_info_mti.get("teamName", team_info_mti.get("battingTeamName", team_info_mti.get("bowlingTeamName")))
+                        if team_name_raw_mti:
+                            norm_team_mti = normalize(team_name_raw_mti)
+                            if norm_team_mti != "Unknown" and norm_team_mti not in current_teams_found:
+                                current_teams_found.append(norm_team_mti)
+                
+                if len(current_teams_found) >= 1: effective_team1_name_norm = current_teams_found[0]
+                if len(current_teams_found) >= 2: effective_team2_name_norm = current_teams_found[1]
+    else:
+        if log: log.info(f"DBUG Player Map Build: No matchHeader found for match {match_id_for_log}. Relying on innings for team info.")
+
+    needs_discovery_from_innings = (
+        effective_team1_name_norm == "Unknown" or 
+        effective_team2_name_norm == "Unknown" or
+        (effective_team1_name_norm != "Unknown" and effective_team1_name_norm == effective_team2_name_norm)
+    )
+
+    innings_list_for_team_discovery = get_innings_list(scorecard_json)
+    if needs_discovery_from_innings and innings_list_for_team_discovery:
+        discovered_teams_set = set()
+        if effective_team1_name_norm != "Unknown":
+            discovered_teams_set.add(effective_team1_name_norm)
+        if effective_team2_name_norm != "Unknown" and effective_team2_name_norm != effective_team1_name_norm : 
+            discovered_teams_set.add(effective_team2_name_norm)
+
+        for i_data in innings_list_for_team_discovery:
+            if len(discovered_teams_set) >= 2: 
+                break
+            if isinstance(i_data, dict):
+                bat_team_name_raw_disc = None
+                if 'batTeamDetails' in i_data: 
+                    bat_team_name_raw_disc = i_data.get('batTeamDetails',{}).get('batTeamName')
+                elif 'batTeamName' in i_data: 
+                    bat_team_name_raw_disc = i_data.get('batTeamName')
+                
+                if bat_team_name_raw_disc:
+                    norm_team = normalize(bat_team_name_raw_disc)
+                    if norm_team != "Unknown":
+                        discovered_teams_set.add(norm_team) 
+        
+        discovered_list = list(discovered_teams_set)
+        if len(discovered_list) >= 1:
+            effective_team1_name_norm = discovered_list[0]
+        if len(discovered_list) >= 2:
+            effective_team2_name_norm = discovered_list[1]
+        elif len(discovered_list) == 1: 
+            effective_team2_name_norm = "Unknown"
+
+    innings_list = get_innings_list(scorecard_json) 
+    for innings_data in innings_list:
+        if not isinstance(innings_data, dict): continue
+        
+        current_bat_team_norm_ing = "Unknown"
+        current_bowl_team_norm_ing = "Unknown"
+
+        bat_team_name_raw_ing = None
+        if 'batTeamDetails' in innings_data: bat_team_name_raw_ing = innings_data.get('batTeamDetails', {}).get('batTeamName')
+        elif 'batTeamName' in innings_data: bat_team_name_raw_ing = innings_data.get('batTeamName')
+        
+        if bat_team_name_raw_ing:
+            current_bat_team_norm_ing = normalize(bat_team_name_raw_ing)
+
+        if current_bat_team_norm_ing != "Unknown":
+            if effective_team1_name_norm != "Unknown" and effective_team2_name_norm != "Unknown" and effective_team1_name_norm != effective_team2_name_norm:
+                if current_bat_team_norm_ing == effective_team1_name_norm:
+                    current_bowl_team_norm_ing = effective_team2_name_norm
+                elif current_bat_team_norm_ing == effective_team2_name_norm:
+                    current_bowl_team_norm_ing = effective_team1_name_norm
+            elif effective_team1_name_norm != "Unknown" and current_bat_team_norm_ing != effective_team1_name_norm:
+                current_bowl_team_norm_ing = effective_team1_name_norm
+            elif effective_team2_name_norm != "Unknown" and current_bat_team_norm_ing != effective_team2_name_norm:
+                current_bowl_team_norm_ing = effective_team2_name_norm
+
+        player_sources_configs = [
+            {'key_in_innings': 'batTeamDetails', 'player_list_path': ['batsmenData'], 'team_norm': current_bat_team_norm_ing, 'id_key': 'batId', 'name_keys': ['fullName', 'batName', 'name']}, # Prioritize fullName
+            {'key_in_innings': 'bowlTeamDetails', 'player_list_path': ['bowlersData'], 'team_norm': current_bowl_team_norm_ing, 'id_key': 'bowlerId', 'name_keys': ['fullName', 'bowlName', 'name']}, # Prioritize fullName
+            {'key_in_innings': 'batsman', 'player_list_path': None, 'team_norm': current_bat_team_norm_ing, 'id_key': 'id', 'name_keys': ['fullName', 'name']}, # Prioritize fullName
+            {'key_in_innings': 'bowler', 'player_list_path': None, 'team_norm': current_bowl_team_norm_ing, 'id_key': 'id', 'name_keys': ['fullName', 'name']}  # Prioritize fullName
+        ]
+        
+        for config in player_sources_configs:
+            player_list_data = None
+            if config['player_list_path'] is None: 
+                if config['key_in_innings'] in innings_data:
+                    player_list_data = innings_data.get(config['key_in_innings'])
+            else: 
+                if config['key_in_innings'] in innings_data:
+                    current_level = innings_data.get(config['key_in_innings'], {})
+                    for part in config['player_list_path']: 
+                        if not isinstance(current_level, dict) : current_level = {}; break 
+                        current_level = current_level.get(part, {})
+                    if isinstance(current_level, dict): player_list_data = list(current_level.values()) 
+                    elif isinstance(current_level, list): player_list_data = current_level
+
+            if not player_list_data or not isinstance(player_list_data, list): continue
+
+            team_for_this_list = config['team_norm']
+            id_key = config['id_key']
+            name_keys = config['name_keys']
+
+            for p_data in player_list_data:
+                if not isinstance(p_data, dict): continue
+                p_id = p_data.get(id_key)
+                
+                p_name_candidate = ""
+                for nk in name_keys:
+                    name_val = p_data.get(nk, "").strip()
+                    if name_val:
+                        p_name_candidate = name_val
+                        break 
+                
+                if p_id and p_name_candidate:
+                    is_new_name_generic = (p_name_candidate == "Unknown" or 
+                                           p_name_candidate.startswith("Fielder ID") or 
+                                           p_name_candidate.startswith("Player ID"))
+
+                    if p_id in player_map:
+                        if player_map[p_id]['team_name_normalized'] == "Unknown" and team_for_this_list != "Unknown":
+                            player_map[p_id]['team_name_normalized'] = team_for_this_list
+                        
+                        current_name_in_map = player_map[p_id]['name']
+                        is_current_name_generic = (not current_name_in_map or 
+                                                   current_name_in_map == "Unknown" or 
+                                                   current_name_in_map.startswith(f"Fielder ID {p_id}") or 
+                                                   current_name_in_map.startswith(f"Player ID {p_id}"))
+
+                        if not is_new_name_generic:
+                            if is_current_name_generic:
+                                player_map[p_id]['name'] = p_name_candidate
+                            elif len(p_name_candidate) > len(current_name_in_map):
+                                player_map[p_id]['name'] = p_name_candidate
+                            elif len(p_name_candidate) == len(current_name_in_map) and \
+                                 p_name_candidate.count(' ') > current_name_in_map.count(' ') and \
+                                 not is_current_name_generic :
+                                 player_map[p_id]['name'] = p_name_candidate
+
+
+                    else:
+                        player_map[p_id] = {
+                            'name': p_name_candidate if not is_new_name_generic else f"Player ID {p_id}", 
+                            'team_name_normalized': team_for_this_list
+                        }
+                    
+                    if not is_new_name_generic:
+
+                        if p_name_candidate.lower() not in name_to_id_map :
+                            name_to_id_map[p_name_candidate.lower()] = p_id
+
+    return player_map, name_to_id_map
+
+
+def player_map_rows(match_id, player_map, name_to_id_map):
+    """silver_match_players rows (match_id, player_id, player_seq, player_name, team_name, name_keys).
+
+    name_keys holds the [position, name] pairs of name_to_id_map that point at the player.
+    Returns None when the map does not fit the table (non-integer ids, over-long names);
+    such matches are rebuilt from the scorecard by their readers instead.
+    """
+    name_keys = {}
+    for position, (name_key, player_id) in enumerate(name_to_id_map.items()):
+        name_keys.setdefault(player_id, []).append([position, name_key])
+    rows = []
+    for player_seq, (player_id, info) in enumerate(player_map.items()):
+        if not isinstance(player_id, int) or isinstance(player_id, bool) or not 0 < player_id <= MAX_PLAYER_ID:
+            return None
+        if len(info['name']) > 255 or len(info['team_name_normalized']) > 100:
+            return None
+        rows.append((match_id, player_id, player_seq, info['name'], info['team_name_normalized'],
+                     json.dumps(name_keys.get(player_id, []), ensure_ascii=False)))
+    return rows
+
+
+def player_map_from_rows(rows):
+    """Rebuild (player_map, name_to_id_map) from (player_id, player_name, team_name, name_keys) rows in player_seq order"""
+    player_map = {}
+    positioned_names = []
+    for player_id, player_name, team_name, name_keys in rows:
+        player_map[player_id] = {'name': player_name, 'team_name_normalized': team_name}
+        for position, name_key in json.loads(name_keys):
+            positioned_names.append((position, name_key, player_id))
+    positioned_names.sort()
+    return player_map, {name_key: player_id for _, name_key, player_id in positioned_names}
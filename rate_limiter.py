@@ -0,0 +1,137 @@
+# rate_limiter.py
+import random
+import threading
+import time
+
+
+class QuotaExhaustedError(Exception):
+    """Raised when the daily request budget (ours or the provider's) is used up."""
+
+
+class RateLimiter:
+    """Token bucket + adaptive concurrency limit for the RapidAPI fetcher.
+
+    Tokens refill at `rate_per_sec` up to `burst`. The number of requests in flight is
+    capped by a limit that halves on every 429 and creeps back up on success (AIMD),
+    never exceeding `max_concurrency`. `daily_budget` is the number of requests this
+    run may still spend today; the provider's remaining-quota header tightens it further
+    and `budget_reserve` requests are always left unspent.
+    """
+
+    # RapidAPI rate-limit headers (lowercased)
+    LIMIT_HEADER = "x-ratelimit-requests-limit"
+    REMAINING_HEADER = "x-ratelimit-requests-remaining"
+    RESET_HEADER = "x-ratelimit-requests-reset"
+
+    def __init__(self, rate_per_sec=5.0, burst=5, max_concurrency=4, daily_budget=None,
+                 budget_reserve=0, backoff_base=1.0, backoff_cap=60.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.budget_remaining = daily_budget
+        self.budget_reserve = budget_reserve
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._clock = clock
+        self._sleep = sleep
+
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._last_refill = clock()
+        self._concurrency_limit = float(max_concurrency)
+        self._in_flight = 0
+
+        self.stats = {
+            'requests': 0, 'throttled': 0, 'retries': 0, 'wait_seconds': 0.0,
+            'backoff_seconds': 0.0, 'min_concurrency': max_concurrency,
+            'provider_limit': None, 'provider_remaining': None
+        }
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate_per_sec)
+        self._last_refill = now
+
+    def _budget_left(self):
+        remaining = [r for r in (self.budget_remaining, self.stats['provider_remaining']) if r is not None]
+        return min(remaining) - self.budget_reserve if remaining else None
+
+    def acquire(self):
+        """Block until a token and a concurrency slot are free, then spend one request of budget"""
+        started = self._clock()
+        with self._cond:
+            while True:
+                budget_left = self._budget_left()
+                if budget_left is not None and budget_left <= 0:
+                    raise QuotaExhaustedError("Daily request budget exhausted")
+                self._refill()
+                if self._in_flight < int(self._concurrency_limit) and self._tokens >= 1:
+                    break
+                if self._tokens < 1:
+                    delay = (1 - self._tokens) / self.rate_per_sec
+                    self._cond.wait(timeout=delay)
+                else:
+                    self._cond.wait()
+            self._tokens -= 1
+            self._in_flight += 1
+            self.stats['requests'] += 1
+            if self.budget_remaining is not None:
+                self.budget_remaining -= 1
+            if self.stats['provider_remaining'] is not None:
+                self.stats['provider_remaining'] -= 1
+            self.stats['wait_seconds'] += self._clock() - started
+
+    def release(self, status=None, headers=None):
+        """Free the concurrency slot and adapt to the response status and rate-limit headers"""
+        with self._cond:
+            self._in_flight -= 1
+            self.update_from_headers(headers or {})
+            if status == 429:
+                self.stats['throttled'] += 1
+                self._concurrency_limit = max(1.0, self._concurrency_limit / 2)
+                self.stats['min_concurrency'] = min(self.stats['min_concurrency'], int(self._concurrency_limit))
+            elif status is not None and status < 400:
+                self._concurrency_limit = min(self.max_concurrency, self._concurrency_limit + 1.0 / self._concurrency_limit)
+            self._cond.notify_all()
+
+    def update_from_headers(self, headers):
+        headers = {k.lower(): v for k, v in headers.items()}
+        try:
+            if self.LIMIT_HEADER in headers:
+                self.stats['provider_limit'] = int(headers[self.LIMIT_HEADER])
+            if self.REMAINING_HEADER in headers:
+                self.stats['provider_remaining'] = int(headers[self.REMAINING_HEADER])
+        except (TypeError, ValueError):
+            pass
+
+    def mark_exhausted(self):
+        with self._cond:
+            self.budget_remaining = self.budget_reserve
+            self._cond.notify_all()
+
+    def backoff(self, attempt, retry_after=None):
+        """Sleep before retry `attempt` (0-based): Retry-After if given, else full-jitter exponential"""
+        try:
+            delay = float(retry_after) if retry_after is not None else None
+        except (TypeError, ValueError):
+            delay = None
+        if delay is None:
+            delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+        with self._cond:
+            self.stats['retries'] += 1
+            self.stats['backoff_seconds'] += delay
+        self._sleep(delay)
+
+    def report(self):
+        s = self.stats
+        lines = [
+            "📊 Rate limiter summary:",
+            f"   Requests sent: {s['requests']} | 429s: {s['throttled']} | Retries: {s['retries']}",
+            f"   Waited for tokens/slots: {s['wait_seconds']:.1f}s | Backoff sleep: {s['backoff_seconds']:.1f}s",
+            f"   Concurrency limit: min {s['min_concurrency']}, final {int(self._concurrency_limit)} of {self.max_concurrency}",
+            f"   Budget remaining: ours {self.budget_remaining if self.budget_remaining is not None else 'unlimited'}, "
+            f"provider {s['provider_remaining'] if s['provider_remaining'] is not None else 'unknown'}"
+            f"{' of ' + str(s['provider_limit']) if s['provider_limit'] is not None else ''}"
+        ]
+        return "\n".join(lines)
@@ -2,16 +2,54 @@
 import os
 import json
 import boto3
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import mysql.connector
 from mysql.connector import Error
 from datetime import datetime
+from json_storage import RAW_PAYLOAD_FORMATS, read_json_text, compress_payload, scorecard_hot_fields
+from raw_sources import S3Source
 from airflow.exceptions import AirflowException
 from airflow.utils.log.logging_mixin import LoggingMixin
 
 bucket_name = '  '
 
+RAW_ROW_COLUMNS = {
+    "raw_scorecard": ("match_id", "file_name", "json_data", "payload", "payload_encoding", "hot_fields", "source_etag"),
+    "raw_commentary": ("match_id", "file_name", "json_data", "payload", "payload_encoding", "source_etag"),
+}
+
+# Compressed payload columns, used instead of json_data when payload_format is not "json"
+RAW_PAYLOAD_COLUMNS = [
+    ("payload", "LONGBLOB AFTER json_data"),
+    ("payload_encoding", "VARCHAR(10) AFTER payload"),
+]
+# Hot scorecard fields materialised as STORED generated columns so lookups never read the
+# document. They come from json_data, or from the small hot_fields document (same paths)
+# written alongside a compressed payload.
+RAW_SCORECARD_GENERATED_COLUMNS = [
+    ("team1_name", "VARCHAR(100) AS (LEFT(COALESCE(json_data->>'$.matchHeader.team1.name', "
+                   "hot_fields->>'$.matchHeader.team1.name'), 100)) STORED"),
+    ("team2_name", "VARCHAR(100) AS (LEFT(COALESCE(json_data->>'$.matchHeader.team2.name', "
+                   "hot_fields->>'$.matchHeader.team2.name'), 100)) STORED"),
+    ("match_status", "VARCHAR(255) AS (LEFT(COALESCE(json_data->>'$.status', hot_fields->>'$.status'), 255)) STORED"),
+    # epoch milliseconds, as in matchHeader.matchStartTimestamp
+    ("match_start_ts", "BIGINT AS (CAST(COALESCE(json_data->>'$.matchHeader.matchStartTimestamp', "
+                       "hot_fields->>'$.matchHeader.matchStartTimestamp') AS UNSIGNED)) STORED"),
+    ("innings_count", "TINYINT UNSIGNED AS (COALESCE(JSON_LENGTH(json_data, '$.scoreCard'), "
+                      "JSON_LENGTH(json_data, '$.scorecard'), hot_fields->>'$.inningsCount', 0)) STORED"),
+]
+# Document columns a generated column can read. MySQL stores GENERATION_EXPRESSION in its
+# own rewritten form, so an existing column is compared by which of these it reads
+GENERATED_COLUMN_SOURCES = ("json_data", "hot_fields")
+RAW_SCORECARD_INDEXES = [
+    ("idx_raw_scard_start", "match_start_ts, match_id"),
+    ("idx_raw_scard_teams", "team1_name, team2_name"),
+    ("idx_raw_scard_status", "match_status, innings_count"),
+]
+
 class RawProcessor(LoggingMixin):
-    def __init__(self, aws_config=None, mysql_config=None, bucket_name=None):
+    def __init__(self, aws_config=None, mysql_config=None, bucket_name=None, download_workers=8, max_buffered_matches=16,
+                 insert_batch_size=25, source=None, payload_format="json", insert_batch_bytes=16 * 1024 * 1024):
         # Default configs (can be overridden)
         self.aws_config = aws_config or {
             'aws_access_key_id': '  ',
@@ -25,13 +63,24 @@ class RawProcessor(LoggingMixin):
             'password': '  '
         }
         self.bucket_name = bucket_name
+        self.download_workers = download_workers          # parallel source downloads
+        self.max_buffered_matches = max_buffered_matches  # downloaded-but-not-inserted matches held in memory
+        self.insert_batch_size = insert_batch_size        # matches (scorecard + commentary) per multi-row INSERT transaction
+        self.insert_batch_bytes = insert_batch_bytes      # document bytes per batch, kept under max_allowed_packet (64 MB by default)
+        self.source = source  # raw_sources backend; defaults to the S3 bucket
+        if payload_format not in RAW_PAYLOAD_FORMATS:
+            raise ValueError(f"Unknown payload_format '{payload_format}', expected one of {RAW_PAYLOAD_FORMATS}")
+        self.payload_format = payload_format  # "json" column, or "zlib"/"zstd" bytes in the payload BLOB
         self.s3 = None
         self.connection = None
+        self.changed_match_ids = set()  # match_ids (re)loaded by the last load_data_from_s3 run
         self._initialize_clients()
 
     def _initialize_clients(self):
         try:
-            self.s3 = boto3.client('s3', **self.aws_config)
+            if self.source is None:
+                self.s3 = boto3.client('s3', **self.aws_config)
+                self.source = S3Source(self.s3, self.bucket_name)
             self._create_db_connection()
         except Exception as e:
             self.log.error(f"Initialization error in RawProcessor: {e}")
@@ -69,6 +118,100 @@ class RawProcessor(LoggingMixin):
         finally:
             cursor.close()
 
+    def _upsert_batch(self, table, rows):
+        """Upsert rows of RAW_ROW_COLUMNS[table] in one transaction; return the match_ids stored.
+
+        If the multi-row statement fails, the batch is rolled back and retried row by row so a
+        single bad document only loses itself.
+        """
+        if not rows:
+            return set()
+        if not self.connection or not self.connection.is_connected():
+            self._create_db_connection()
+
+        columns = RAW_ROW_COLUMNS[table]
+        query = f"""
+            INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})
+            ON DUPLICATE KEY UPDATE {', '.join(f'{c} = VALUES({c})' for c in columns[1:])},
+                load_timestamp = CURRENT_TIMESTAMP
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(query, rows)
+            self.connection.commit()
+            return {row[0] for row in rows}
+        except Error as e:
+            self.connection.rollback()
+            self.log.warning(f"Batch upsert into {table} failed ({e}), retrying {len(rows)} rows individually")
+        finally:
+            cursor.close()
+
+        stored = set()
+        for row in rows:
+            try:
+                self._execute_sql(query, row)
+                stored.add(row[0])
+            except AirflowException as e:
+                self.log.error(f"Failed to upsert {row[0]} into {table}: {e}")
+        return stored
+
+    def _load_existing_etags(self):
+        """Return ({match_id: etag} for raw_scorecard, same for raw_commentary) with a single query"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT 'scard', match_id, source_etag FROM raw_scorecard
+                UNION ALL
+                SELECT 'comm', match_id, source_etag FROM raw_commentary
+            """)
+            existing = {'scard': {}, 'comm': {}}
+            for table, match_id, etag in cursor.fetchall():
+                existing[table][match_id] = etag
+            return existing['scard'], existing['comm']
+        finally:
+            cursor.close()
+
+    def _ensure_column(self, table, column, definition):
+        """Add a column to an existing table if an older schema is missing it.
+
+        A generated column that exists but does not read every source its definition now
+        reads (e.g. raw_scorecard columns created from json_data alone, before hot_fields)
+        is redefined in place.
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT GENERATION_EXPRESSION FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+            """, (table, column))
+            existing = cursor.fetchone()
+        finally:
+            cursor.close()
+        if existing is None:
+            self._execute_sql(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            self.log.info(f"Added column {column} to {table}")
+            return
+        current_expression = (existing[0] or "").lower()
+        if " AS (" in definition and any(source in definition and source not in current_expression
+                                         for source in GENERATED_COLUMN_SOURCES):
+            self._execute_sql(f"ALTER TABLE {table} MODIFY COLUMN {column} {definition}")
+            self.log.info(f"Redefined generated column {column} on {table}")
+
+    def _ensure_index(self, table, index, columns):
+        """Create an index on an existing table if it is missing"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT COUNT(*) FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+            """, (table, index))
+            exists = cursor.fetchone()[0] > 0
+        finally:
+            cursor.close()
+        if not exists:
+            self._execute_sql(f"CREATE INDEX {index} ON {table} ({columns})")
+            self.log.info(f"Created index {index} on {table}")
+
     def create_raw_tables(self):
         """Create RAW layer tables"""
         try:
@@ -78,6 +221,7 @@ class RawProcessor(LoggingMixin):
                     match_id VARCHAR(100),
                     file_name VARCHAR(255),
                     json_data JSON,
+                    source_etag VARCHAR(100),
                     load_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     UNIQUE KEY unique_match_comm (match_id)
                 )
@@ -89,86 +233,210 @@ class RawProcessor(LoggingMixin):
                     match_id VARCHAR(100),
                     file_name VARCHAR(255),
                     json_data JSON,
+                    source_etag VARCHAR(100),
                     load_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     UNIQUE KEY unique_match_scard (match_id)
                 )
             """)
+            for table in ("raw_commentary", "raw_scorecard"):
+                for column, definition in RAW_PAYLOAD_COLUMNS:
+                    self._ensure_column(table, column, definition)
+                self._ensure_column(table, "source_etag", "VARCHAR(100) AFTER payload_encoding")
+            self._ensure_column("raw_scorecard", "hot_fields", "JSON AFTER payload_encoding")
+            for column, definition in RAW_SCORECARD_GENERATED_COLUMNS:
+                self._ensure_column("raw_scorecard", column, definition)
+            for index, columns in RAW_SCORECARD_INDEXES:
+                self._ensure_index("raw_scorecard", index, columns)
             self.log.info("RAW tables created/verified successfully")
             return True
         except Error as e:
             self.log.error(f"Error creating RAW tables: {e}")
             raise AirflowException(f"Table creation failed: {e}")
 
+    def _download_match(self, task):
+        """Download the changed objects of one match as raw JSON text; runs on a download worker thread.
+
+        Documents are passed through to the JSON column unparsed, so cost scales with
+        payload size rather than with a Python object graph.
+        """
+        match_id, scard, comm = task
+        scard_values = comm_values = comm_error = None
+        if scard:
+            scard_values = self._stored_values(read_json_text(*self.source.read(scard[0])), with_hot_fields=True)
+        if comm:
+            try:
+                comm_values = self._stored_values(read_json_text(*self.source.read(comm[0])))
+            except Exception as e:
+                comm_error = e
+        return scard_values, comm_values, comm_error
+
+    def _stored_values(self, text, with_hot_fields=False):
+        """Column values (json_data, payload, payload_encoding[, hot_fields]) for one document"""
+        if self.payload_format == "json":
+            values = (text, None, None)
+            return values + (None,) if with_hot_fields else values
+        values = (None, compress_payload(text, self.payload_format), self.payload_format)
+        return values + (json.dumps(scorecard_hot_fields(json.loads(text))),) if with_hot_fields else values
+
+    @staticmethod
+    def _row_bytes(row):
+        """Approximate statement size of one RAW row: the length of its text and binary values"""
+        return sum(len(value) for value in row if isinstance(value, (str, bytes)))
+
+    def _iter_downloads(self, tasks):
+        """Yield (task, result, error) as downloads finish.
+
+        At most `max_buffered_matches` downloads are scheduled or waiting to be consumed at
+        any time, so memory stays flat however many matches the bucket holds.
+        """
+        pending_tasks = iter(tasks)
+        with ThreadPoolExecutor(max_workers=self.download_workers) as pool:
+            in_flight = {}
+            for task in pending_tasks:
+                in_flight[pool.submit(self._download_match, task)] = task
+                if len(in_flight) >= self.max_buffered_matches:
+                    break
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = in_flight.pop(future)
+                    try:
+                        yield task, future.result(), None
+                    except Exception as e:
+                        yield task, None, e
+                    next_task = next(pending_tasks, None)
+                    if next_task is not None:
+                        in_flight[pool.submit(self._download_match, next_task)] = next_task
+
     def load_data_from_s3(self):
-        """Load data from S3 with detailed progress tracking"""
+        """Load new and changed match files from the source (S3 unless another backend was given).
+
+        An object is (re)loaded when its source ETag differs from the one stored with the RAW
+        row. The match_ids whose scorecard or commentary changed are left in
+        `self.changed_match_ids` for downstream stages.
+        """
+        self.changed_match_ids = set()
         try:
-            self.log.info("Listing match folders from S3...")
-            response = self.s3.list_objects_v2(Bucket=self.bucket_name, Delimiter='/')
-            
-            if 'CommonPrefixes' not in response:
-                self.log.warning("No match folders found in S3 bucket!")
+            self.log.info(f"Listing match objects from {self.source}...")
+            listing = self.source.list_match_objects()
+
+            if not listing:
+                self.log.warning(f"No match folders found in {self.source}!")
                 return 0
-                
-            folders = [prefix['Prefix'] for prefix in response.get('CommonPrefixes', [])]
-            self.log.info(f"Found {len(folders)} match folders in S3 bucket")
-            
+
+            self.log.info(f"Found {len(listing)} match folders in {self.source}")
+
+            loaded_scard_etags, loaded_comm_etags = self._load_existing_etags()
+            tasks, missing_scorecard = [], []
+            for match_id, objects in sorted(listing.items()):
+                if 'scard' not in objects:
+                    missing_scorecard.append(match_id)
+                    continue
+                scard = objects['scard'] if loaded_scard_etags.get(match_id) != objects['scard'][1] else None
+                comm = objects.get('comm') if objects.get('comm') and loaded_comm_etags.get(match_id) != objects['comm'][1] else None
+                if scard or comm:
+                    tasks.append((match_id, scard, comm))
+            skipped_existing = len(listing) - len(tasks) - len(missing_scorecard)
+            if missing_scorecard:
+                self.log.warning(f"Skipping {len(missing_scorecard)} match folders without a scorecard: "
+                                 f"{', '.join(missing_scorecard[:10])}{' ...' if len(missing_scorecard) > 10 else ''}")
+
+            self.log.info(f"Downloading {len(tasks)} new/changed matches with {self.download_workers} workers...")
             total_loaded = 0
-            skipped_existing = 0
-            
-            for folder in folders:
-                match_id_from_folder = folder.rstrip('/')
-                
-                try:
-                    # Check if match already exists
-                    cursor = self.connection.cursor()
-                    cursor.execute("SELECT 1 FROM raw_scorecard WHERE match_id = %s", (match_id_from_folder,))
-                    if cursor.fetchone():
-                        self.log.info(f"Skipping already loaded match: {match_id_from_folder}")
-                        skipped_existing += 1
-                        cursor.close()
-                        continue
-                    cursor.close()
-                    
-                    # Load scorecard data
-                    scard_key = f"{folder}{match_id_from_folder}_scard.json"
-                    obj = self.s3.get_object(Bucket=self.bucket_name, Key=scard_key)
-                    scard_data = json.loads(obj['Body'].read().decode('utf-8'))
-                    
-                    self._execute_sql(
-                        "INSERT INTO raw_scorecard (match_id, file_name, json_data) VALUES (%s, %s, %s)",
-                        (match_id_from_folder, scard_key, json.dumps(scard_data))
-                    )
-                    
-                    # Try to load commentary if exists
-                    try:
-                        comm_key = f"{folder}{match_id_from_folder}_comm.json"
-                        obj = self.s3.get_object(Bucket=self.bucket_name, Key=comm_key)
-                        comm_data = json.loads(obj['Body'].read().decode('utf-8'))
-                        
-                        self._execute_sql(
-                            "INSERT INTO raw_commentary (match_id, file_name, json_data) VALUES (%s, %s, %s)",
-                            (match_id_from_folder, comm_key, json.dumps(comm_data))
-                        )
-                        self.log.info(f"Loaded match with commentary: {match_id_from_folder}")
-                    except Exception as e:
-                        if hasattr(e, 'response') and e.response.get('Error', {}).get('Code') == 'NoSuchKey':
-                             self.log.info(f"Loaded match (no commentary file found): {match_id_from_folder}")
-                        else:
-                            self.log.warning(f"Warning loading commentary for {match_id_from_folder} (scorecard loaded): {str(e)}")
-                    
-                    total_loaded += 1
-                    
-                except Exception as e:
-                    self.log.error(f"Failed to process {match_id_from_folder}: {str(e)}")
+            scard_rows, comm_rows = [], []
+            batch_matches, batch_bytes = 0, 0
+
+            def flush():
+                nonlocal batch_matches, batch_bytes
+                stored_scard = self._upsert_batch("raw_scorecard", scard_rows)
+                # Commentary only goes in alongside a stored scorecard
+                stored_comm = self._upsert_batch("raw_commentary", [
+                    row for row in comm_rows if row[0] in stored_scard or row[0] in loaded_scard_etags
+                ])
+                for match_id in sorted(stored_scard | stored_comm):
+                    action = "Reloaded changed" if match_id in loaded_scard_etags else "Loaded"
+                    self.log.info(f"{action} match {'with commentary' if match_id in stored_comm else '(scorecard only)'}: {match_id}")
+                self.changed_match_ids.update(stored_scard, stored_comm)
+                scard_rows.clear()
+                comm_rows.clear()
+                batch_matches, batch_bytes = 0, 0
+                return len(stored_scard)
+
+            for task, downloaded, download_error in self._iter_downloads(tasks):
+                match_id, scard, comm = task
+                if download_error:
+                    self.log.error(f"Failed to process {match_id}: {str(download_error)}")
                     continue
-            
-            self.log.info(f"Loaded {total_loaded} new matches, skipped {skipped_existing} existing matches")
-            return total_loaded
+
+                scard_values, comm_values, comm_error = downloaded
+                match_scard = (match_id, scard[0], *scard_values, scard[1]) if scard else None
+                match_comm = None
+
+                # Commentary is optional
+                if comm_error:
+                    self.log.warning(f"Warning loading commentary for {match_id}: {str(comm_error)}")
+                elif comm_values is not None:
+                    match_comm = (match_id, comm[0], *comm_values, comm[1])
+
+                # A multi-MB commentary document can push one multi-row INSERT past
+                # max_allowed_packet, so batches are closed by size as well as by count
+                match_bytes = sum(self._row_bytes(row) for row in (match_scard, match_comm) if row)
+                if (scard_rows or comm_rows) and batch_bytes + match_bytes > self.insert_batch_bytes:
+                    total_loaded += flush()
+                if match_scard:
+                    scard_rows.append(match_scard)
+                if match_comm:
+                    comm_rows.append(match_comm)
+                if match_scard or match_comm:
+                    batch_matches += 1
+                batch_bytes += match_bytes
+
+                if batch_matches >= self.insert_batch_size:
+                    total_loaded += flush()
+            total_loaded += flush()
+
+            self.log.info(f"Loaded {total_loaded} new/changed scorecards ({len(self.changed_match_ids)} matches changed), "
+                          f"skipped {skipped_existing} unchanged matches and {len(missing_scorecard)} folders without a scorecard")
+            return len(self.changed_match_ids)
             
         except Exception as e:
             self.log.error(f"S3 loading error: {e}")
             raise AirflowException(f"S3 loading failed: {e}")
 
+    def get_matches_since(self, since):
+        """(match_id, team1, team2, status, match_start_ts) of matches starting at/after `since`.
+
+        `since` is a datetime or epoch milliseconds; answered from idx_raw_scard_start
+        without reading json_data.
+        """
+        since_ms = int(since.timestamp() * 1000) if isinstance(since, datetime) else int(since)
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT match_id, team1_name, team2_name, match_status, match_start_ts
+                FROM raw_scorecard
+                WHERE match_start_ts >= %s
+                ORDER BY match_start_ts, match_id
+            """, (since_ms,))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def report_storage_footprint(self):
+        """Log the on-disk size of the RAW tables (data and indexes, per information_schema)"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT TABLE_NAME, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ('raw_scorecard', 'raw_commentary')
+            """)
+            footprint = cursor.fetchall()
+        finally:
+            cursor.close()
+        for table, rows, data_length, index_length in footprint:
+            self.log.info(f"{table}: ~{rows} rows, data {data_length / 1e6:.1f} MB, indexes {index_length / 1e6:.1f} MB")
+        return footprint
+
     def close_connection(self):
         if self.connection and self.connection.is_connected():
             self.connection.close()
@@ -0,0 +1,65 @@
+# raw_reader.py
+
+# raw_scorecard rows fetched per round trip; bounds memory to one chunk of documents
+RAW_READ_CHUNK_SIZE = 50
+
+RAW_SCORECARD_COLUMNS = "r.match_id, r.json_data, r.payload, r.payload_encoding"
+
+
+class RawScorecardReader:
+    """Stream raw_scorecard (or another RAW `table`, e.g. raw_commentary) rows in match_id
+    order, one keyset-paginated chunk at a time.
+
+    Rows are (match_id, json_data, payload, payload_encoding, *extra_columns), ready for
+    json_storage.decode_raw_json(*row[1:4]). Each chunk is a complete
+    `... WHERE r.match_id > <last seen> ORDER BY r.match_id LIMIT n` query, so no result
+    set stays open and the caller can write on the same connection between rows.
+    `join`/`where` refer to the RAW table as `r`. The first chunk is fetched on
+    construction, so query errors surface there and `bool(reader)` tells whether any
+    rows exist.
+    """
+
+    def __init__(self, connection, extra_columns=(), join="", where="", params=(), chunk_size=RAW_READ_CHUNK_SIZE,
+                 table="raw_scorecard"):
+        self.connection = connection
+        self.table = table
+        self.extra_columns = list(extra_columns)
+        self.join = join
+        self.where = where
+        self.params = tuple(params)
+        self.chunk_size = chunk_size
+        self.rows_read = 0
+        self._first_chunk = self._fetch_chunk(None)
+
+    def _fetch_chunk(self, after_match_id):
+        conditions = [f"({self.where})"] if self.where else []
+        params = list(self.params)
+        if after_match_id is not None:
+            conditions.append("r.match_id > %s")
+            params.append(after_match_id)
+        columns = ", ".join([RAW_SCORECARD_COLUMNS] + self.extra_columns)
+        query = f"""
+            SELECT {columns} FROM {self.table} r {self.join}
+            {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+            ORDER BY r.match_id LIMIT %s
+        """
+        params.append(self.chunk_size)
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, tuple(params))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def __bool__(self):
+        return bool(self._first_chunk)
+
+    def __iter__(self):
+        chunk = self._first_chunk
+        while chunk:
+            for row in chunk:
+                self.rows_read += 1
+                yield row
+            if len(chunk) < self.chunk_size:
+                return
+            chunk = self._fetch_chunk(chunk[-1][0])
@@ -0,0 +1,184 @@
+# raw_sources.py
+"""Where RawProcessor reads match files from.
+
+Every source exposes the same two calls:
+    list_match_objects() -> {match_id: {'scard': (key, etag), 'comm': (key, etag)}}
+    read(key)            -> (body_bytes, content_encoding or None)
+Keys use the bucket layout `{match}/{match}_scard.json` in all backends, and the etag
+is whatever cheaply identifies the object's current content in that backend.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+ARCHIVE_MAGIC = b"IPLRAW01"
+ARCHIVE_SUFFIX = ".iplpack"
+# footer: index offset, index length, magic
+_FOOTER = struct.Struct("<QQ8s")
+
+
+def group_match_objects(keys_and_etags):
+    """Group (key, etag) pairs into {match_id: {'scard': (key, etag), 'comm': (key, etag)}}.
+
+    Anything other than the two per-match files (live deltas, manifests, ...) is ignored.
+    """
+    matches = {}
+    for key, etag in keys_and_etags:
+        match_id, _, file_name = key.partition('/')
+        for kind in ('scard', 'comm'):
+            if file_name == f"{match_id}_{kind}.json":
+                matches.setdefault(match_id, {})[kind] = (key, etag)
+    return matches
+
+
+class S3Source:
+    """Match files in an S3 bucket; ETags come from the listing.
+
+    Only match folders are listed, never the whole bucket: one delimited listing finds
+    the top-level folders (bucket-root objects such as the manifest and request budgets
+    are left out), then each folder is listed with a delimiter too, so its live/ deltas
+    and state stay rolled up into a single prefix. Folder listings run `list_workers`
+    at a time.
+    """
+
+    def __init__(self, s3_client, bucket_name, list_workers=8):
+        self.s3 = s3_client
+        self.bucket_name = bucket_name
+        self.list_workers = list_workers
+
+    def __repr__(self):
+        return f"s3://{self.bucket_name}"
+
+    def _list(self, prefix, field):
+        paginator = self.s3.get_paginator('list_objects_v2')
+        return [item for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix, Delimiter='/')
+                for item in page.get(field, [])]
+
+    def _list_folder(self, folder_prefix):
+        return [(obj['Key'], obj['ETag'].strip('"')) for obj in self._list(folder_prefix, 'Contents')]
+
+    def list_match_objects(self):
+        folders = [prefix['Prefix'] for prefix in self._list('', 'CommonPrefixes')]
+        with ThreadPoolExecutor(max_workers=self.list_workers) as pool:
+            return group_match_objects(
+                key_and_etag for listing in pool.map(self._list_folder, folders) for key_and_etag in listing)
+
+    def read(self, key):
+        obj = self.s3.get_object(Bucket=self.bucket_name, Key=key)
+        return obj['Body'].read(), obj.get('ContentEncoding')
+
+    def close(self):
+        pass
+
+
+class LocalDirectorySource:
+    """Match files in a local directory tree with the bucket layout.
+
+    The etag is size + mtime, so listing never reads file contents.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+
+    def __repr__(self):
+        return self.root
+
+    def list_match_objects(self):
+        def walk():
+            with os.scandir(self.root) as folders:
+                for folder in folders:
+                    if not folder.is_dir():
+                        continue
+                    with os.scandir(folder.path) as files:
+                        for f in files:
+                            if f.is_file():
+                                st = f.stat()
+                                yield f"{folder.name}/{f.name}", f"{st.st_size:x}-{st.st_mtime_ns:x}"
+        return group_match_objects(walk())
+
+    def read(self, key):
+        with open(os.path.join(self.root, *key.split('/')), 'rb') as f:
+            return f.read(), None
+
+    def close(self):
+        pass
+
+
+class ArchiveSource:
+    """Many match files packed into one file, read through a memory map.
+
+    Layout: magic, the object bodies back to back, a JSON index
+    {key: [offset, length, etag]} and a fixed-size footer pointing at the index.
+    Build one with `write_archive`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        index_offset, index_length, magic = _FOOTER.unpack(self._map[-_FOOTER.size:])
+        if magic != ARCHIVE_MAGIC or self._map[:len(ARCHIVE_MAGIC)] != ARCHIVE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a raw match archive")
+        self._index = json.loads(self._map[index_offset:index_offset + index_length])
+
+    def __repr__(self):
+        return self.path
+
+    def list_match_objects(self):
+        return group_match_objects((key, etag) for key, (_, _, etag) in self._index.items())
+
+    def read(self, key):
+        offset, length, _ = self._index[key]
+        return self._map[offset:offset + length], None
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def write_archive(path, objects):
+    """Pack (key, body_bytes) pairs into an archive at `path`; returns the number packed.
+
+    Bodies are stored as given (compressed objects stay compressed) and the etag is
+    their md5, matching what S3 reports for single-part uploads.
+    """
+    index = {}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(ARCHIVE_MAGIC)
+        for key, body in objects:
+            index[key] = [f.tell(), len(body), hashlib.md5(body).hexdigest()]
+            f.write(body)
+        index_offset = f.tell()
+        index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        f.write(index_bytes)
+        f.write(_FOOTER.pack(index_offset, len(index_bytes), ARCHIVE_MAGIC))
+    os.replace(tmp_path, path)
+    return len(index)
+
+
+def pack_source(source, path):
+    """Snapshot every match file of `source` (e.g. a whole season in S3) into an archive"""
+    listing = source.list_match_objects()
+    return write_archive(path, (
+        (key, source.read(key)[0])
+        for match_id in sorted(listing)
+        for key, _ in listing[match_id].values()
+    ))
+
+
+def open_source(location, s3_client=None):
+    """Source for `location`: an archive file, a local directory, or else an S3 bucket name"""
+    if os.path.isfile(location):
+        return ArchiveSource(location)
+    if os.path.isdir(location):
+        return LocalDirectorySource(location)
+    if s3_client is None:
+        raise ValueError(f"{location} is not a local archive or directory and no S3 client was given")
+    return S3Source(s3_client, location)
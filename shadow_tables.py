@@ -0,0 +1,76 @@
+# shadow_tables.py
+"""Rebuild GOLD tables without readers ever seeing them empty.
+
+Each table is rebuilt in an empty copy (`<table>__shadow`, CREATE TABLE ... LIKE). Once
+all of them are filled, one multi-table RENAME TABLE swaps the copies in. MySQL
+performs that rename atomically, so dashboards read either the previous contents
+or the new ones, never an empty or half-filled table. The previous contents are
+then dropped.
+"""
+SHADOW_SUFFIX = "__shadow"
+RETIRED_SUFFIX = "__retired"
+
+
+class ShadowSwap:
+    """Context manager that builds `tables` in shadow copies and publishes them on a clean exit.
+
+        with ShadowSwap(connection, ["gold_a", "gold_b"]) as swap:
+            cursor.execute(f"INSERT INTO {swap.target('gold_a')} ...")
+
+    If the block raises, the shadows are dropped and the live tables stay untouched.
+    `discard(table)` does the same for a single table, e.g. when its rebuild failed.
+    """
+
+    def __init__(self, connection, tables, log=None):
+        self.connection = connection
+        self.tables = list(tables)
+        self.log = log
+
+    def _run(self, *statements):
+        cursor = self.connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    def __enter__(self):
+        for table in self.tables:
+            self._run(f"DROP TABLE IF EXISTS {table}{SHADOW_SUFFIX}",
+                      f"CREATE TABLE {table}{SHADOW_SUFFIX} LIKE {table}")
+        return self
+
+    def target(self, table):
+        """Table to write `table`'s new contents into"""
+        return f"{table}{SHADOW_SUFFIX}" if table in self.tables else table
+
+    def discard(self, table):
+        """Drop `table`'s shadow so the live table keeps its current contents"""
+        if table in self.tables:
+            self.tables.remove(table)
+            self._run(f"DROP TABLE IF EXISTS {table}{SHADOW_SUFFIX}")
+            if self.log:
+                self.log.info(f"↩️ Keeping previous contents of {table}")
+
+    def publish(self):
+        if not self.tables:
+            return
+        self.connection.commit()
+        self._run(*[f"DROP TABLE IF EXISTS {table}{RETIRED_SUFFIX}" for table in self.tables])
+        self._run("RENAME TABLE " + ", ".join(
+            f"{table} TO {table}{RETIRED_SUFFIX}, {table}{SHADOW_SUFFIX} TO {table}" for table in self.tables))
+        self._run(f"DROP TABLE {', '.join(table + RETIRED_SUFFIX for table in self.tables)}")
+        if self.log:
+            self.log.info(f"🔁 Published {len(self.tables)} rebuilt GOLD tables: {', '.join(self.tables)}")
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.publish()
+            return False
+        try:
+            self.connection.rollback()
+            for table in list(self.tables):
+                self.discard(table)
+        except Exception:
+            pass  # the original error is the one worth raising
+        return False
@@ -0,0 +1,172 @@
+# standings_engine.py
+"""Vectorized points table and net run rate.
+
+Produces the same gold_team_stats rows as TransformProcessor._compute_standings_reference,
+from the same three inputs (silver_match_summary rows, grouped silver_batting totals and
+grouped silver_extras totals), but the season is held as arrays: one entry per match
+for teams and outcome, and match x team matrices for runs, balls and extras. Only name
+normalisation (once per distinct string) and super-over status parsing stay in Python.
+"""
+import re
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for this engine, the reference loop runs without it
+    np = None
+
+SUPER_OVER_WINNER = re.compile(r'\((.*?) won the super over\)', re.IGNORECASE)
+# Balls charged to a side bowled out before its 20 overs were up
+ALL_OUT_BALLS = 120.0
+
+
+def _teams_from_match_id(match_id, normalize):
+    """(team1, team2) spelled out in a '<id>_<Team1>_vs_<Team2>' match_id, or None"""
+    parts = match_id.split('_')
+    if len(parts) < 3:
+        return None
+    match_name_part = '_'.join(parts[1:])
+    if "_vs_" not in match_name_part:
+        return None
+
+    def normalize_from_filename(name):
+        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1 \2', name)
+        return normalize(re.sub('([a-z0-9])([A-Z])', r'\1 \2', s1).replace('-', ' '))
+
+    return tuple(normalize_from_filename(raw) for raw in match_name_part.split('_vs_', 1))
+
+
+def _normalized(values, normalize):
+    """Canonical names for `values`, calling `normalize` once per distinct value"""
+    lookup = {value: normalize(value) if value else "Unknown" for value in set(values)}
+    return np.array([lookup[value] for value in values], dtype=object)
+
+
+def _lookup(keys, values):
+    """Position of each of `values` in the distinct `keys`, -1 where absent"""
+    if len(keys) == 0 or len(values) == 0:
+        return np.full(len(values), -1, dtype=np.intp)
+    keys = np.asarray(keys, dtype=object)
+    values = np.asarray(values, dtype=object)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    pos = np.minimum(np.searchsorted(sorted_keys, values), len(keys) - 1)
+    return np.where(sorted_keys[pos] == values, order[pos], -1)
+
+
+def _team_codes(team1, team2):
+    """Team list in first-appearance order plus per-match codes (-1 for Unknown)"""
+    names = np.empty(2 * len(team1), dtype=object)
+    names[0::2], names[1::2] = team1, team2
+    distinct, first_seen, inverse = np.unique(names, return_index=True, return_inverse=True)
+    known = np.flatnonzero([name.lower() != "unknown" for name in distinct])
+    known = known[np.argsort(first_seen[known], kind="stable")]
+    rank = np.full(len(distinct), -1, dtype=np.intp)
+    rank[known] = np.arange(len(known))
+    codes = rank[inverse.reshape(-1)]
+    return distinct[known], codes[0::2], codes[1::2]
+
+
+def compute_standings(matches, batting_rows, extras_rows, normalize):
+    """Points table as ordered (team, played, won, lost, tied, no_result, points, nrr) tuples.
+
+    `matches` are silver_match_summary rows as dicts in match_id order, `batting_rows`
+    (match_id, batting_team, runs, balls, wickets) totals of innings 1 and 2, `extras_rows`
+    (match_id, batting_team, extras) and `normalize` the processor's team name resolver.
+    """
+    if np is None:
+        raise ValueError("The numpy standings engine requires the numpy package")
+    if not matches:
+        return []
+
+    # --- Teams: normalise each distinct spelling once, recover no-result teams from the match_id ---
+    match_ids = [match['match_id'] for match in matches]
+    team1 = _normalized([match['team1_name'] for match in matches], normalize)
+    team2 = _normalized([match['team2_name'] for match in matches], normalize)
+    winner = _normalized([match['match_winner'] for match in matches], normalize)
+    no_result = np.array([bool(match['is_no_result']) for match in matches])
+    is_tie = np.array([bool(match['is_tie']) for match in matches])
+    status = [match['match_status'] or "" for match in matches]
+
+    for i in np.flatnonzero(no_result):
+        if team1[i].lower() == "unknown" or team2[i].lower() == "unknown":
+            from_id = _teams_from_match_id(match_ids[i], normalize)
+            if from_id:
+                if team1[i].lower() == "unknown": team1[i] = from_id[0]
+                if team2[i].lower() == "unknown": team2[i] = from_id[1]
+
+    teams, t1, t2 = _team_codes(team1, team2)
+    n_matches, n_teams = len(matches), len(teams)
+
+    # --- Outcomes ---
+    super_over = ~no_result & (np.char.find(np.char.lower(np.array(status, dtype=str)), "super over") >= 0)
+    super_over_winner = np.full(n_matches, None, dtype=object)
+    for i in np.flatnonzero(super_over):
+        found = SUPER_OVER_WINNER.search(status[i])
+        if found:
+            super_over_winner[i] = normalize(found.group(1).strip())
+    so_win1 = super_over & (super_over_winner == team1)
+    so_win2 = super_over & ~so_win1 & (super_over_winner == team2)
+
+    regular = ~no_result & ~super_over
+    decided = regular & ~is_tie & np.array([name.lower() != "unknown" for name in winner])
+    won_by_1 = so_win1 | (decided & (winner == team1))
+    won_by_2 = so_win2 | (decided & (winner != team1) & (winner == team2))
+    tied = (super_over & ~so_win1 & ~so_win2) | (regular & is_tie)
+
+    def tally(codes, mask):
+        return np.bincount(codes[mask & (codes >= 0)], minlength=n_teams)
+
+    everything = np.ones(n_matches, dtype=bool)
+    played = tally(t1, everything) + tally(t2, everything)
+    matches_no_result = tally(t1, no_result) + tally(t2, no_result)
+    matches_tied = tally(t1, tied) + tally(t2, tied)
+    matches_won = tally(t1, won_by_1) + tally(t2, won_by_2)
+    matches_lost = tally(t2, won_by_1) + tally(t1, won_by_2)
+    points = 2 * matches_won + matches_tied + matches_no_result
+
+    # --- Match x team run/ball matrices, all-out sides charged the full 120 balls ---
+    runs = np.zeros((n_matches, n_teams))
+    balls = np.zeros((n_matches, n_teams))
+    batted = np.zeros((n_matches, n_teams), dtype=bool)
+    extras = np.zeros((n_matches, n_teams))
+    if batting_rows:
+        b_match = _lookup(match_ids, [row[0] for row in batting_rows])
+        b_team = _lookup(teams, _normalized([row[1] for row in batting_rows], normalize))
+        b_runs = np.array([float(row[2] or 0) for row in batting_rows])
+        b_balls = np.array([float(row[3] or 0) for row in batting_rows])
+        b_wickets = np.array([int(row[4] or 0) for row in batting_rows])
+        b_balls = np.where((b_wickets >= 10) & (b_balls < ALL_OUT_BALLS), ALL_OUT_BALLS, b_balls)
+        keep = (b_match >= 0) & (b_team >= 0)
+        runs[b_match[keep], b_team[keep]] = b_runs[keep]
+        balls[b_match[keep], b_team[keep]] = b_balls[keep]
+        batted[b_match[keep], b_team[keep]] = True
+    if extras_rows:
+        e_match = _lookup(match_ids, [row[0] for row in extras_rows])
+        e_team = _lookup(teams, [row[1] for row in extras_rows])
+        e_extras = np.array([int(row[2] or 0) for row in extras_rows])
+        keep = (e_match >= 0) & (e_team >= 0)
+        np.add.at(extras, (e_match[keep], e_team[keep]), e_extras[keep])
+
+    # --- NRR: each side of a completed match where both teams batted ---
+    runs_scored, balls_faced = np.zeros(n_teams), np.zeros(n_teams)
+    runs_conceded, balls_bowled = np.zeros(n_teams), np.zeros(n_teams)
+    both_known = np.flatnonzero(~no_result & (t1 >= 0) & (t2 >= 0))
+    for team, opponent in ((t1[both_known], t2[both_known]), (t2[both_known], t1[both_known])):
+        ok = batted[both_known, team] & batted[both_known, opponent]
+        rows, team, opponent = both_known[ok], team[ok], opponent[ok]
+        np.add.at(runs_scored, team, runs[rows, team] + extras[rows, team])
+        np.add.at(balls_faced, team, balls[rows, team])
+        np.add.at(runs_conceded, team, runs[rows, opponent] + extras[rows, opponent])
+        np.add.at(balls_bowled, team, balls[rows, opponent])
+
+    overs_faced = np.where(balls_faced > 0, balls_faced / 6.0, 0.1)
+    overs_bowled = np.where(balls_bowled > 0, balls_bowled / 6.0, 0.1)
+    nrr_raw = runs_scored / np.maximum(overs_faced, 0.1) - runs_conceded / np.maximum(overs_bowled, 0.1)
+    # Python's round, so ties at the third decimal break exactly as in the reference
+    nrr = np.array([round(value, 3) for value in nrr_raw.tolist()])
+
+    order = np.lexsort((-nrr, -points))
+    columns = [teams[order].tolist(), played[order].tolist(), matches_won[order].tolist(),
+               matches_lost[order].tolist(), matches_tied[order].tolist(), matches_no_result[order].tolist(),
+               points[order].tolist(), nrr[order].tolist()]
+    return list(zip(*columns))
@@ -0,0 +1,89 @@
+# team_names.py
+from functools import lru_cache
+
+from fuzzywuzzy import fuzz
+
+KNOWN_TEAM_NAME_MAP = {
+    "Mumbai Indians": ["MI", "Mumbai"],
+    "Chennai Super Kings": ["CSK", "Chennai"],
+    "Royal Challengers Bengaluru": ["RCB", "Bangalore", "Royal Challengers Bangalore"],
+    "Delhi Capitals": ["DC", "Delhi"],
+    "Gujarat Titans": ["GT"],
+    "Lucknow Super Giants": ["LSG", "Lucknow"],
+    "Kolkata Knight Riders": ["KKR", "Kolkata"],
+    "Punjab Kings": ["PBKS", "Kings XI Punjab", "Punjab"],
+    "Rajasthan Royals": ["RR", "Rajasthan"],
+    "Sunrisers Hyderabad": ["SRH", "Hyderabad", "Sunrisers H"]
+}
+
+UNKNOWN = "Unknown"
+
+
+class TeamNameResolver:
+    """Maps raw team strings to canonical franchise names.
+
+    Canonical names and their aliases live in one lowercase hash map. Strings that miss
+    it are fuzzy-matched (fuzz.ratio above `fuzzy_threshold`) against the canonical
+    names once, and the outcome is memoised in an LRU of `memo_size` entries.
+    """
+
+    def __init__(self, alias_map=None, fuzzy_threshold=85, memo_size=4096):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.memo_size = memo_size
+        self._canonical = []
+        self._aliases = {}
+        self.stats = {'lookups': 0, 'alias_hits': 0}
+        self._fuzzy = lru_cache(maxsize=memo_size)(self._fuzzy_match)
+        for canonical, aliases in (alias_map or KNOWN_TEAM_NAME_MAP).items():
+            self.register_alias(canonical, *aliases)
+
+    def register_alias(self, canonical, *aliases):
+        """Add a canonical name (if new) and extra spellings for it"""
+        if canonical not in self._canonical:
+            self._canonical.append(canonical)
+            # An exact canonical name always wins over another team's alias
+            self._aliases[canonical.lower()] = canonical
+        for alias in aliases:
+            self._aliases.setdefault(alias.lower(), canonical)
+        self._fuzzy.cache_clear()
+
+    def settings(self):
+        """Constructor kwargs for an equivalent resolver, e.g. in another process (the memo is not picklable)"""
+        alias_map = {canonical: [] for canonical in self._canonical}
+        for alias, canonical in self._aliases.items():
+            if alias != canonical.lower():
+                alias_map[canonical].append(alias)
+        return {'alias_map': alias_map, 'fuzzy_threshold': self.fuzzy_threshold, 'memo_size': self.memo_size}
+
+    def _fuzzy_match(self, name_lower):
+        best_match_score = 0
+        best_canonical_name = None
+        for canonical_name in self._canonical:
+            score = fuzz.ratio(name_lower, canonical_name.lower())
+            if score > best_match_score:
+                best_match_score = score
+                best_canonical_name = canonical_name
+        return best_canonical_name if best_match_score > self.fuzzy_threshold else None
+
+    def resolve(self, name_variant):
+        """Canonical name, "Unknown" for empty/unknown input, or None when nothing matches"""
+        if not name_variant or not isinstance(name_variant, str):
+            return UNKNOWN
+        name_variant_lower = name_variant.strip().lower()
+        if not name_variant_lower or name_variant_lower == "unknown":
+            return UNKNOWN
+        self.stats['lookups'] += 1
+        canonical = self._aliases.get(name_variant_lower)
+        if canonical is not None:
+            self.stats['alias_hits'] += 1
+            return canonical
+        return self._fuzzy(name_variant_lower)
+
+    def report(self):
+        memo = self._fuzzy.cache_info()
+        return (f"Team names: {self.stats['lookups']} lookups, {self.stats['alias_hits']} alias hits, "
+                f"fuzzy memo {memo.hits} hits / {memo.misses} misses ({memo.currsize} cached)")
+
+
+# Shared by every processor in the process, so each raw string is fuzzy-matched once
+default_resolver = TeamNameResolver()
@@ -0,0 +1,99 @@
+import os
+import re
+import sys
+
+# The pipeline modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.rowcount = 0
+        self._rows = []
+
+    def execute(self, query, params=None, multi=False):
+        self._rows = list(self.connection.run(query, params))
+        self.rowcount = len(self._rows)
+
+    def executemany(self, query, seq_params):
+        seq_params = list(seq_params)
+        for params in seq_params:
+            self.connection.run(query, params)
+        self.rowcount = len(seq_params)
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Stand-in for a mysql.connector connection.
+
+    Every statement is recorded in `statements` as (normalised query, params). Table DDL
+    (CREATE [IF NOT EXISTS] / CREATE ... LIKE / DROP / RENAME) and INSERT/DELETE are applied
+    to `tables`, {name: [params rows]}; SELECTs are answered by `rows(query, params)`.
+    A query containing `fail_on` raises `error`.
+    """
+
+    def __init__(self, tables=None, rows=None, fail_on=None, error=RuntimeError):
+        self.tables = {name: list(contents) for name, contents in (tables or {}).items()}
+        self.rows = rows or (lambda query, params: [])
+        self.fail_on = fail_on
+        self.error = error
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def is_connected(self):
+        return True
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+    def run(self, query, params):
+        query = " ".join(query.split())
+        self.statements.append((query, params))
+        if self.fail_on and self.fail_on in query:
+            raise self.error(f"failing on purpose: {query}")
+        if query.startswith("SELECT"):
+            return self.rows(query, params)
+        found = re.match(r"CREATE TABLE (IF NOT EXISTS )?(\w+)", query)
+        if found:
+            if found.group(2) in self.tables and not found.group(1):
+                raise self.error(f"table {found.group(2)} exists")
+            self.tables.setdefault(found.group(2), [])
+        elif query.startswith("DROP TABLE IF EXISTS "):
+            self.tables.pop(query.split()[-1], None)
+        elif query.startswith("DROP TABLE "):
+            for name in query[len("DROP TABLE "):].split(", "):
+                del self.tables[name]
+        elif query.startswith("RENAME TABLE "):
+            for pair in query[len("RENAME TABLE "):].split(", "):
+                old, new = pair.split(" TO ")
+                assert new not in self.tables, f"RENAME onto existing {new}"
+                self.tables[new] = self.tables.pop(old)
+        elif query.startswith("INSERT INTO "):
+            self.tables.setdefault(query.split()[2], []).append(params)
+        elif query.startswith("DELETE FROM "):
+            self.tables[query.split()[2]] = []
+        return []
+
+    def queries(self, prefix):
+        return [(query, params) for query, params in self.statements if query.startswith(prefix)]
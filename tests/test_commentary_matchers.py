@@ -0,0 +1,109 @@
+"""The compiled dropped-catch matcher against the per-phrasing searches it replaced."""
+import re
+
+import pytest
+
+import benchmarks
+from commentary_matchers import has_drop_keyword, match_dropped_catch, match_dropped_catch_reference
+
+BOLD_DROPPED = {"bold": {"formatId": ["B0$"], "formatValue": ["DROPPED!"]}}
+BOLD_OTHER = {"bold": {"formatId": ["B0$"], "formatValue": ["FOUR"]}}
+
+# (commText, commentaryFormats) as Cricbuzz sends them: bold runs are either inlined as
+# **...** or replaced by a B0$ placeholder whose text is in commentaryFormats
+FIXTURES = [
+    ("Bumrah to Kohli, 1 run, **Dropped!** Hardik Pandya drops a dolly at mid-off", {}),
+    ("Bumrah to Kohli, 1 run, B0$ Hardik Pandya drops a dolly at mid-off", BOLD_DROPPED),
+    ("Bumrah to Kohli, no run, **DROPPED!** dropped by Tim David at long-on", {}),
+    ("Bumrah to Kohli, no run, B0$ dropped by Tim David at long-on", BOLD_DROPPED),
+    ("Chahar to Rohit, 2 runs, **Dropped!** Jadeja and Dhoni converge, the latter spills it", {}),
+    ("Chahar to Rohit, 2 runs, B0$ Jadeja and Dhoni converge, the former puts it down", BOLD_DROPPED),
+    ("Chahar to Rohit, FOUR, B0$ Gaikwad spills a tough chance over his head", BOLD_OTHER),
+    ("Chahar to Rohit, **FOUR**, Gaikwad misfields and it races away", {}),
+    ("Rashid to Gill, 1 run, **missed chance by Saha** behind the stumps", {}),
+    ("Rashid to Gill, 1 run, missed chance by Saha, B0$", BOLD_DROPPED),
+    ("Rashid to Gill, no run, **Rahul Tewatia couldn't hold on** at deep midwicket, dropped!", {}),
+    ("Rashid to Gill, no run, Rahul Tewatia shells it at cover, B0$", BOLD_DROPPED),
+    ("Rashid to Gill, no run, **dropped!** nobody went for it", {}),
+    ("Rashid to Gill, no run, B0$ that's a spill, nobody near it", BOLD_DROPPED),
+    ("**Dropped!** Shubman Gill Drops It and Sai Sudharsan Spills The Rebound", {}),
+    ("kohli drops it, all lowercase and still a drop", {}),
+    ("Nortje to Buttler, 6 runs, huge, into the stands", {}),
+    ("Nortje to Buttler, 1 run, B0$", BOLD_DROPPED),
+]
+
+
+def original_extract(comm_text, commentary_formats):
+    """CustomStatsProcessor._extract_fielder_from_dropped_catch before the precompiled matchers,
+    without its fuzzy fallback: the fielder, or None when no phrasing matched"""
+    drop_keywords = ["dropped!", "spills", "drops", "put down", "missed chance", "spill", "misfield"]
+    name = r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)"
+    drop_patterns = [
+        rf"dropped by\s+{name}",
+        rf"{name}\s+(?:drops\b|spills|puts down|misfields)",
+        rf"{name}\s+and\s+{name}\s+converge,\s+(?:the former|the latter)",
+        rf"missed chance\s+by\s+{name}",
+        rf"{name}\s+couldn't\s+hold\s+on",
+        rf"{name}\s+shells\s+it",
+    ]
+
+    def resolve(match):
+        groups = match.groups()
+        if len(groups) > 1 and 'former' in comm_text:
+            return groups[0].strip()
+        elif len(groups) > 1 and 'latter' in comm_text:
+            return groups[1].strip()
+        return groups[0].strip()
+
+    if not any(keyword in comm_text.lower() for keyword in drop_keywords):
+        return None
+    if commentary_formats and 'bold' in commentary_formats:
+        for bold_val in commentary_formats['bold'].get('formatValue', []):
+            if any(keyword in bold_val.lower() for keyword in ["drop", "spill"]):
+                for pattern in drop_patterns:
+                    match = re.search(pattern, comm_text, re.IGNORECASE)
+                    if match:
+                        return resolve(match)
+    for pattern in drop_patterns:
+        match = re.search(pattern, comm_text, re.IGNORECASE)
+        if match:
+            return resolve(match)
+    return None
+
+
+def compiled_extract(comm_text):
+    return match_dropped_catch(comm_text) if has_drop_keyword(comm_text) else None
+
+
+@pytest.mark.parametrize("comm_text, commentary_formats", FIXTURES)
+def test_fixtures_match_the_original_extraction(comm_text, commentary_formats):
+    assert compiled_extract(comm_text) == original_extract(comm_text, commentary_formats)
+
+
+@pytest.mark.parametrize("comm_text, commentary_formats", FIXTURES)
+def test_fixtures_match_the_reference_matcher(comm_text, commentary_formats):
+    assert match_dropped_catch(comm_text) == match_dropped_catch_reference(comm_text)
+
+
+def test_fixtures_exercise_drops():
+    assert sum(original_extract(*fixture) is not None for fixture in FIXTURES) >= 10
+
+
+def test_commentary_corpus_matches_the_reference():
+    lines = benchmarks.commentary_corpus(6)
+    lines += [f"**{line}**" for line in lines[::5]]
+    lines += [line.replace("dropped!", "**Dropped!**") for line in lines if "dropped!" in line]
+    results = [(match_dropped_catch(line), match_dropped_catch_reference(line)) for line in lines]
+    assert all(compiled == reference for compiled, reference in results)
+    assert sum(compiled is not None for compiled, _ in results) > 50
+    for line in lines:
+        assert compiled_extract(line) == original_extract(line, BOLD_DROPPED), line
+
+
+def test_custom_stats_extraction_matches_the_original():
+    custom_stats_processor = pytest.importorskip("custom_stats_processor")
+    processor = custom_stats_processor.CustomStatsProcessor.__new__(custom_stats_processor.CustomStatsProcessor)
+    processor._last_name_index = None
+    for comm_text, commentary_formats in FIXTURES:
+        extracted = processor._extract_fielder_from_dropped_catch(comm_text, commentary_formats, {}, {})
+        assert extracted == original_extract(comm_text, commentary_formats), comm_text
@@ -0,0 +1,98 @@
+"""CustomStatsProcessor's shared raw_scorecard pass and its GOLD shadow swap."""
+import json
+import logging
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+pytest.importorskip("airflow")
+pytest.importorskip("fuzzywuzzy")
+
+import benchmarks
+from conftest import FakeConnection
+from custom_stats_processor import CustomStatsProcessor
+from mysql.connector import Error
+from team_names import default_resolver
+
+PER_STAT_METHODS = {
+    "gold_bowler_clean_bowled_stats": "calculate_bowler_clean_bowled_stats",
+    "gold_team_powerplay_stats": "calculate_team_avg_powerplay_score",
+    "gold_fielder_catch_stats": "calculate_fielder_catches",
+    "gold_latest_match_summary": "update_latest_match_summary",
+}
+
+
+def raw_scorecard_rows(matches=30):
+    """(match_id, json_data, payload, payload_encoding, team1, team2, status, start_ts) in match_id order"""
+    rows = []
+    for match_id, scorecard, _ in benchmarks.synthetic_season(matches):
+        header = scorecard["matchHeader"]
+        rows.append((match_id, json.dumps(scorecard), None, None, header["team1"]["name"], header["team2"]["name"],
+                     scorecard.get("status"), header["matchStartTimestamp"]))
+    return sorted(rows)
+
+
+def answer_raw_scorecard(rows):
+    """SELECT handler serving raw_scorecard the way RawScorecardReader pages through it"""
+    def select(query, params):
+        if "FROM raw_scorecard" not in query:
+            return []
+        if "LIMIT 1" in query:
+            return [max(rows, key=lambda row: (row[7], row[0]))[:7]]
+        found = [row for row in rows if "r.match_id > %s" not in query or row[0] > params[-2]]
+        return [row if "r.team1_name" in query else row[:4] for row in found[:params[-1]]]
+    return select
+
+
+def processor(connection):
+    stats = CustomStatsProcessor.__new__(CustomStatsProcessor)
+    stats.log = logging.getLogger(__name__)
+    stats.team_resolver = default_resolver
+    stats.gold_swap = None
+    stats._last_name_index = None
+    stats.scorecard_stats = stats._default_scorecard_stats()
+    stats.connection = connection
+    return stats
+
+
+def writes(connection, table):
+    return [statement for statement in connection.statements if statement[0].startswith(f"INSERT INTO {table} ")]
+
+
+def test_single_pass_matches_per_stat_passes():
+    rows = raw_scorecard_rows()
+    single = FakeConnection(rows=answer_raw_scorecard(rows))
+    assert processor(single).run_scorecard_stats() == []
+    assert sum("FROM raw_scorecard" in query and "LIMIT %s" in query for query, _ in single.statements) == 1
+
+    for table, method in PER_STAT_METHODS.items():
+        separate = FakeConnection(rows=answer_raw_scorecard(rows))
+        getattr(processor(separate), method)()
+        assert writes(separate, table), table
+        assert writes(single, table) == writes(separate, table), table
+
+
+def test_single_pass_pages_through_raw_scorecard():
+    rows = raw_scorecard_rows()
+    paged = FakeConnection(rows=answer_raw_scorecard(rows))
+    whole = FakeConnection(rows=answer_raw_scorecard(rows))
+    processor(paged).run_scorecard_stats(chunk_size=7)
+    processor(whole).run_scorecard_stats()
+    assert sum("FROM raw_scorecard" in query and "LIMIT %s" in query for query, _ in paged.statements) == 5
+    for table in PER_STAT_METHODS:
+        assert writes(paged, table) == writes(whole, table), table
+
+
+def test_failed_stat_keeps_its_previous_gold_table():
+    rows = raw_scorecard_rows(8)
+    gold = {table: [("previous",)] for table in list(PER_STAT_METHODS) + [
+        "gold_batsman_performance_metrics", "gold_bowler_performance_metrics", "gold_team_head_to_head_stats"]}
+    connection = FakeConnection(tables=gold, rows=answer_raw_scorecard(rows),
+                                fail_on="INSERT INTO gold_team_powerplay_stats__shadow", error=Error)
+    processor(connection).run_all_custom_stats()
+
+    assert connection.tables["gold_team_powerplay_stats"] == [("previous",)]
+    assert connection.tables["gold_latest_match_summary"] != [("previous",)]
+    assert connection.tables["gold_bowler_clean_bowled_stats"] != [("previous",)]
+    assert not any(name.endswith(("__shadow", "__retired")) for name in connection.tables)
+    assert len(connection.queries("RENAME TABLE")) == 1
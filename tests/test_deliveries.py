@@ -0,0 +1,105 @@
+"""parse_outcome and build_delivery_rows on Cricbuzz commentary text."""
+import pytest
+
+from deliveries import SILVER_DELIVERY_COLUMNS, build_delivery_rows, parse_outcome
+
+
+@pytest.mark.parametrize("outcome, expected", [
+    # (runs_batter, boundary, extras, extra_type, wicket_type, fielder_name)
+    ("no run, defended back to the bowler", (0, None, 0, None, None, None)),
+    ("1 run, worked to deep midwicket", (1, None, 0, None, None, None)),
+    ("2 runs, driven through the covers", (2, None, 0, None, None, None)),
+    ("FOUR, slapped past point", (4, 4, 0, None, None, None)),
+    ("SIX, into the stands", (6, 6, 0, None, None, None)),
+    ("wide, down the leg side", (0, None, 1, "wide", None, None)),
+    ("2 wides, beats the keeper too", (0, None, 2, "wide", None, None)),
+    ("5 wides, over everyone's head to the fence", (0, None, 5, "wide", None, None)),
+    ("no ball, full toss above the waist", (0, None, 1, "noball", None, None)),
+    ("no ball, 2 runs, free hit coming", (2, None, 1, "noball", None, None)),
+    ("no-ball, FOUR, and a free hit", (4, 4, 1, "noball", None, None)),
+    ("no ball, SIX, what a start", (6, 6, 1, "noball", None, None)),
+    ("byes, 1 run, misses the keeper", (0, None, 1, "bye", None, None)),
+    ("byes, FOUR, through the keeper's legs", (0, None, 4, "bye", None, None)),
+    ("leg byes, 2 runs, off the pad", (0, None, 2, "legbye", None, None)),
+    ("leg bye, no run", (0, None, 0, "legbye", None, None)),
+    ("out Caught by Rohit Sharma!! Top edge and taken", (0, None, 0, None, "caught", "Rohit Sharma")),
+    ("out Bowled!! Middle stump out of the ground", (0, None, 0, None, "bowled", None)),
+    ("out Lbw!! Plumb in front", (0, None, 0, None, "lbw", None)),
+    ("out Stumped by Dhoni, lightning quick", (0, None, 0, None, "stumped", "Dhoni")),
+    ("out Run Out by Jadeja (Kohli), direct hit", (0, None, 0, None, "run out", "Jadeja")),
+    ("out Hit Wicket!! Treads on his stumps", (0, None, 0, None, "hit wicket", None)),
+    ("out, obstructing the field", (0, None, 0, None, "other", None)),
+])
+def test_parse_outcome(outcome, expected):
+    assert parse_outcome(outcome) == expected
+
+
+def entry(text, over, ball_nbr, timestamp, innings=1, event="NONE", **extra):
+    return {"commText": text, "overNumber": over, "ballNbr": ball_nbr, "timestamp": timestamp,
+            "inningsId": innings, "event": event, "batTeamName": "MI",
+            "batsmanStriker": {"batId": 11, "batName": "Rohit Sharma"},
+            "bowlerStriker": {"bowlId": 22, "bowlName": "Deepak Chahar"}, **extra}
+
+
+def rows_by_column(comm_data):
+    rows = build_delivery_rows("1001_MumbaiIndians_vs_ChennaiSuperKings", comm_data, lambda team: {"MI": "Mumbai Indians"}[team])
+    return [dict(zip(SILVER_DELIVERY_COLUMNS, row)) for row in rows]
+
+
+@pytest.mark.parametrize("entries, expected", [
+    ([entry("Chahar to Rohit, wide, down leg", 0.1, 1, 1000)],
+     [{"over_number": 0, "ball_in_over": 1, "extras": 1, "extra_type": "wide", "total_runs": 1, "is_legal": False}]),
+    ([entry("Chahar to Rohit, no ball, 2 runs, free hit", 3.4, 22, 1000)],
+     [{"runs_batter": 2, "extras": 1, "extra_type": "noball", "total_runs": 3, "is_legal": False, "is_four": False}]),
+    ([entry("Chahar to Rohit, byes, 1 run, misses the stumps", 5.2, 32, 1000)],
+     [{"runs_batter": 0, "extras": 1, "extra_type": "bye", "total_runs": 1, "is_legal": True}]),
+    ([entry("Chahar to Rohit, FOUR, flicked fine", 1.3, 9, 1000, event="FOUR")],
+     [{"runs_batter": 4, "is_four": True, "is_six": False, "total_runs": 4}]),
+    # a FOUR written as "4 runs" still counts as a boundary when the event says so
+    ([entry("Chahar to Rohit, 4 runs, all run", 1.4, 10, 1000, event="NONE"),
+      entry("Chahar to Rohit, 4 runs, races away", 1.5, 11, 1001, event="FOUR")],
+     [{"seq": 1, "is_four": False}, {"seq": 2, "is_four": True}]),
+    ([entry("Chahar to Rohit, out Caught by Jadeja!! Skied it", 9.6, 60, 1000, event="WICKET")],
+     [{"is_wicket": True, "wicket_type": "caught", "fielder_name": "Jadeja", "dropped_by": None, "is_drop": False}]),
+    # a WICKET event without a recognised dismissal clause is still a wicket
+    ([entry("Chahar to Rohit, out, retired out", 12.1, 73, 1000, event="WICKET")],
+     [{"is_wicket": True, "wicket_type": "other", "fielder_name": None}]),
+    ([entry("Chahar to Rohit, 1 run, Dropped! Jadeja spills a sitter at long on", 14.2, 86, 1000)],
+     [{"runs_batter": 1, "is_wicket": False, "fielder_name": None, "dropped_by": "Jadeja", "is_drop": True}]),
+])
+def test_build_delivery_rows(entries, expected):
+    rows = rows_by_column({"commentaryList": entries})
+    assert len(rows) == len(expected)
+    for row, want in zip(rows, expected):
+        assert {column: row[column] for column in want} == want
+        assert row["batting_team"] == "Mumbai Indians"
+        assert (row["batter_id"], row["batter_name"], row["bowler_id"], row["bowler_name"]) == (11, "Rohit Sharma", 22, "Deepak Chahar")
+
+
+def test_non_delivery_entries_are_skipped():
+    entries = [
+        {"commText": "End of over 4: MI 38/1", "overNumber": 4.0, "timestamp": 999},
+        {"commText": "Welcome to the Wankhede for the opener", "timestamp": 900},
+        {"commText": "Chahar to Rohit, no run, defended", "timestamp": 950},  # no over number
+        entry("Chahar to Rohit, 1 run, pushed to cover", 4.1, 25, 1000),
+    ]
+    rows = rows_by_column({"commentaryList": entries})
+    assert [(row["over_number"], row["ball_in_over"], row["seq"]) for row in rows] == [(4, 1, 1)]
+
+
+def test_rows_are_numbered_per_innings_in_bowling_order():
+    # Cricbuzz lists the newest ball first, and the second layout wraps each entry
+    entries = [entry("Bumrah to Gaikwad, 2 runs", 0.2, 2, 2002, innings=2),
+               entry("Chahar to Rohit, no run", 0.2, 2, 1002),
+               entry("Bumrah to Gaikwad, FOUR", 0.1, 1, 2001, innings=2, event="FOUR"),
+               entry("Chahar to Rohit, wide", 0.1, 1, 1001),
+               entry("Chahar to Rohit, 1 run", 0.1, 1, 1000)]
+    rows = rows_by_column({"comwrapper": [{"commentary": item} for item in entries]})
+    assert [(row["innings_id"], row["seq"], row["over_number"], row["ball_in_over"], row["event_ts"]) for row in rows] == [
+        (1, 1, 0, 1, 1000), (1, 2, 0, 1, 1001), (1, 3, 0, 2, 1002), (2, 1, 0, 1, 2001), (2, 2, 0, 2, 2002)]
+    assert all(len(row) == len(SILVER_DELIVERY_COLUMNS) for row in rows)
+
+
+def test_rows_match_columns():
+    rows = build_delivery_rows("m", {"commentaryList": [entry("Chahar to Rohit, no run", 0.1, 1, 1000)]}, str)
+    assert len(rows[0]) == len(SILVER_DELIVERY_COLUMNS)
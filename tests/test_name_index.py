@@ -0,0 +1,94 @@
+"""NameIndex against the all-pairs fuzz.ratio scan it replaced."""
+import random
+
+import pytest
+
+fuzz = pytest.importorskip("fuzzywuzzy.fuzz")
+
+import benchmarks
+from name_index import NameIndex
+from player_maps import build_player_map
+from team_names import default_resolver
+
+SQUAD = ["rohit sharma", "ishan kishan", "suryakumar yadav", "tilak varma", "hardik pandya", "tim david",
+         "jasprit bumrah", "piyush chawla", "ruturaj gaikwad", "ravindra jadeja", "ms dhoni", "deepak chahar",
+         "shivam dube", "matheesha pathirana", "rahul chahar", "rahul tewatia", "rahul tripathi", "kl rahul"]
+
+
+def all_pairs(name_lower, name_to_id_map, min_score):
+    """The original scan: first key in map order with the highest fuzz.ratio, if it reaches min_score"""
+    best_score, best_key = 0, None
+    for key in name_to_id_map:
+        score = fuzz.ratio(name_lower, key)
+        if score > best_score:
+            best_score, best_key = score, key
+    return (best_score, best_key) if best_score >= min_score else (0, None)
+
+
+def season_maps(matches=6):
+    for _, scorecard, _ in benchmarks.synthetic_season(matches):
+        yield build_player_map(scorecard, lambda name: default_resolver.resolve(name) or "Unknown")[1]
+
+
+def queries(known, rng):
+    """Exact names, one-letter typos, surnames, first names, initials and unrelated strings"""
+    for name in known:
+        yield name
+        yield benchmarks._typo(rng, name)
+        yield name.split()[-1]
+        yield name.split()[0]
+        yield f"{name[0]} {name.split()[-1]}"
+    yield from ("", "a", "umpire", "the batter", "sharma rohit", "chahar rahul")
+
+
+@pytest.mark.parametrize("min_score", [80, 90])
+def test_squad_map(min_score):
+    name_to_id_map = {name: n for n, name in enumerate(SQUAD)}
+    index = NameIndex(name_to_id_map)
+    for query in queries(SQUAD, random.Random(1)):
+        assert index.best_match(query, min_score) == all_pairs(query, name_to_id_map, min_score), query
+
+
+@pytest.mark.parametrize("min_score", [80, 90])
+def test_synthetic_season_maps(min_score):
+    rng = random.Random(0)
+    for name_to_id_map in season_maps():
+        index = NameIndex(name_to_id_map)
+        for query in queries(list(name_to_id_map), rng):
+            assert index.best_match(query, min_score) == all_pairs(query, name_to_id_map, min_score), query
+
+
+@pytest.mark.parametrize("min_score", [80, 90])
+def test_ties_pick_the_first_key_in_map_order(min_score):
+    # "rahul chahal" is one edit from both keys, so they score the same
+    for keys in (["rahul chahar", "rahul chahat", "deepak chahar"], ["rahul chahat", "rahul chahar", "deepak chahar"]):
+        name_to_id_map = {key: n for n, key in enumerate(keys)}
+        assert fuzz.ratio("rahul chahal", keys[0]) == fuzz.ratio("rahul chahal", keys[1])
+        expected = all_pairs("rahul chahal", name_to_id_map, min_score)
+        assert expected[1] == keys[0]
+        assert NameIndex(name_to_id_map).best_match("rahul chahal", min_score) == expected
+
+
+@pytest.mark.parametrize("min_score", [80, 90])
+def test_ties_among_near_duplicate_names(min_score):
+    """A map with several spellings of each player (as merged squads end up with), where
+    typo queries often score the same against two keys"""
+    rng = random.Random(2)
+    name_to_id_map = {}
+    for n, name in enumerate(SQUAD):
+        for spelling in (name, benchmarks._typo(rng, name), benchmarks._typo(rng, name)):
+            name_to_id_map.setdefault(spelling, n)
+    index, ties = NameIndex(name_to_id_map), 0
+    for name in SQUAD:
+        for _ in range(20):
+            query = benchmarks._typo(rng, name)
+            scores = [fuzz.ratio(query, key) for key in name_to_id_map]
+            ties += max(scores) >= min_score and scores.count(max(scores)) > 1
+            assert index.best_match(query, min_score) == all_pairs(query, name_to_id_map, min_score), query
+    assert ties > 0
+
+
+def test_nothing_reaches_the_threshold():
+    index = NameIndex({name: n for n, name in enumerate(SQUAD)})
+    assert index.best_match("zzzz", 80) == (0, None)
+    assert NameIndex({}).best_match("rohit sharma", 80) == (0, None)
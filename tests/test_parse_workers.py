@@ -0,0 +1,55 @@
+"""Parallel SILVER parsing normalises team names with the processor's own resolver."""
+import json
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+pytest.importorskip("airflow")
+pytest.importorskip("fuzzywuzzy")
+
+import benchmarks
+from team_names import KNOWN_TEAM_NAME_MAP, TeamNameResolver
+from transform_processor import TransformProcessor
+
+
+def records(matches=12):
+    """RAW records whose team names only a resolver with extra aliases recognises"""
+    rows = []
+    for n, (match_id, scorecard, _) in enumerate(benchmarks.synthetic_season(matches)):
+        text = json.dumps(scorecard).replace("Mumbai Indians", "Paltan").replace("Chennai Super Kings", "Yellove")
+        rows.append((match_id, text, None, None, f"2026-04-{n % 28 + 1:02d} 00:00:00", f"etag{n}"))
+    return rows
+
+
+def parse(resolver, parse_workers):
+    processor = TransformProcessor._offline(resolver)
+    processor.parse_workers = parse_workers
+    return list(processor._parse_records(iter(records())))
+
+
+def test_resolver_settings_round_trip():
+    resolver = TeamNameResolver(fuzzy_threshold=70)
+    resolver.register_alias("Mumbai Indians", "Paltan")
+    resolver.register_alias("Deccan Chargers", "DC")  # DC already means Delhi Capitals and keeps that meaning
+    copy = TeamNameResolver(**resolver.settings())
+    for name in ["Paltan", "DC", "Deccan Chargers", "Mumbai", "Royal Challengers Bangalore", "Rajastan Royal", "Unknown", ""]:
+        assert copy.resolve(name) == resolver.resolve(name), name
+    assert TeamNameResolver(**TeamNameResolver().settings()).settings() == TeamNameResolver(KNOWN_TEAM_NAME_MAP).settings()
+
+
+def test_workers_use_the_processors_resolver():
+    resolver = TeamNameResolver()
+    resolver.register_alias("Mumbai Indians", "Paltan")
+    resolver.register_alias("Chennai Super Kings", "Yellove")
+    serial = parse(resolver, 1)
+    assert all(error is None for _, _, error, _, _ in serial)
+    assert {rows[0][6] for _, rows, _, _, _ in serial} >= {"Mumbai Indians", "Chennai Super Kings"}
+    assert parse(resolver, 2) == serial
+
+
+def test_custom_resolver_class_parses_serially():
+    class Shouting(TeamNameResolver):
+        def resolve(self, name_variant):
+            return super().resolve(name_variant).upper()
+
+    assert parse(Shouting(), 2) == parse(Shouting(), 1)
@@ -0,0 +1,69 @@
+"""RawProcessor.load_data_from_s3 batching against the fake MySQL connection."""
+import logging
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+pytest.importorskip("airflow")
+pytest.importorskip("boto3")
+
+from conftest import FakeConnection
+from raw_processor import RawProcessor
+
+
+class FakeSource:
+    """`matches` match folders with a scorecard and a commentary of `comm_size` characters"""
+
+    def __init__(self, matches, comm_size=100, without_scorecard=()):
+        self.listing = {f"m{n:03d}": {"scard": (f"m{n:03d}/m{n:03d}_scard.json", "s"),
+                                      "comm": (f"m{n:03d}/m{n:03d}_comm.json", "c")} for n in range(matches)}
+        for match_id in without_scorecard:
+            self.listing[match_id] = {"comm": (f"{match_id}/{match_id}_comm.json", "c")}
+        self.comm_size = comm_size
+
+    def list_match_objects(self):
+        return self.listing
+
+    def read(self, key):
+        size = self.comm_size if key.endswith("_comm.json") else 10
+        return f'{{"text": "{"x" * size}"}}'.encode(), None
+
+
+def loader(source, **settings):
+    processor = RawProcessor.__new__(RawProcessor)
+    processor.source = source
+    processor.connection = FakeConnection()
+    processor.payload_format = "json"
+    processor.download_workers = 2
+    processor.max_buffered_matches = 4
+    processor.insert_batch_size = settings.get("insert_batch_size", 25)
+    processor.insert_batch_bytes = settings.get("insert_batch_bytes", 16 * 1024 * 1024)
+    processor.changed_match_ids = set()
+    processor._log = logging.getLogger(__name__)  # LoggingMixin.log, routed through caplog
+    return processor
+
+
+def test_insert_batch_size_counts_matches():
+    processor = loader(FakeSource(30), insert_batch_size=10)
+    commits = []
+    processor.connection.commit = lambda: commits.append(len(processor.connection.tables.get("raw_scorecard", [])))
+    assert processor.load_data_from_s3() == 30
+    # scorecard and commentary of 10 matches per batch, each table committed once per batch
+    assert commits == [10, 10, 20, 20, 30, 30]
+
+
+def test_batches_are_capped_by_payload_bytes():
+    processor = loader(FakeSource(6, comm_size=3000), insert_batch_bytes=7000)
+    commits = []
+    processor.connection.commit = lambda: commits.append(len(processor.connection.tables.get("raw_commentary", [])))
+    assert processor.load_data_from_s3() == 6
+    # two ~3 KB commentaries fit under 7000 bytes, a third would not
+    assert commits == [0, 2, 2, 4, 4, 6]
+
+
+def test_folders_without_a_scorecard_are_reported_separately(caplog):
+    processor = loader(FakeSource(3, without_scorecard=["m900", "m901"]))
+    with caplog.at_level(logging.INFO):
+        processor.load_data_from_s3()
+    assert "Skipping 2 match folders without a scorecard: m900, m901" in caplog.text
+    assert "skipped 0 unchanged matches and 2 folders without a scorecard" in caplog.text
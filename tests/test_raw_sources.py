@@ -0,0 +1,67 @@
+"""S3Source listing against a fake bucket that honours Prefix/Delimiter."""
+from raw_sources import S3Source
+
+
+class FakePaginator:
+    def __init__(self, bucket, calls, page_size):
+        self.bucket, self.calls, self.page_size = bucket, calls, page_size
+
+    def paginate(self, Bucket, Prefix="", Delimiter=None):
+        self.calls.append(Prefix)
+        contents, prefixes = [], []
+        for key in sorted(self.bucket):
+            if not key.startswith(Prefix):
+                continue
+            rest = key[len(Prefix):]
+            if Delimiter and Delimiter in rest:
+                prefix = Prefix + rest.split(Delimiter)[0] + Delimiter
+                if prefix not in prefixes:
+                    prefixes.append(prefix)
+            else:
+                contents.append({"Key": key, "ETag": f'"{self.bucket[key]}"'})
+        for start in range(0, max(len(contents), len(prefixes), 1), self.page_size):
+            yield {"Contents": contents[start:start + self.page_size],
+                   "CommonPrefixes": [{"Prefix": p} for p in prefixes[start:start + self.page_size]]}
+
+
+class FakeS3:
+    def __init__(self, bucket, page_size=2):
+        self.bucket, self.calls, self.page_size = bucket, [], page_size
+
+    def get_paginator(self, name):
+        assert name == "list_objects_v2"
+        return FakePaginator(self.bucket, self.calls, self.page_size)
+
+
+BUCKET = {
+    "request_budget.json": "b1",
+    "live_request_budget.json": "b2",
+    "processed_matches.json": "m1",
+    "1001_MI_vs_CSK/1001_MI_vs_CSK_scard.json": "s1",
+    "1001_MI_vs_CSK/1001_MI_vs_CSK_comm.json": "c1",
+    "1001_MI_vs_CSK/live/state.json": "st",
+    **{f"1001_MI_vs_CSK/live/1001_MI_vs_CSK_comm_delta_{n:05d}.json": f"d{n}" for n in range(1, 40)},
+    "1002_RCB_vs_KKR/1002_RCB_vs_KKR_scard.json": "s2",
+    "1003_GT_vs_RR/1003_GT_vs_RR_comm.json": "c3",
+    "1003_GT_vs_RR/notes.txt": "n3",
+}
+
+
+def test_lists_only_match_files():
+    s3 = FakeS3(BUCKET)
+    assert S3Source(s3, "bucket").list_match_objects() == {
+        "1001_MI_vs_CSK": {"scard": ("1001_MI_vs_CSK/1001_MI_vs_CSK_scard.json", "s1"),
+                           "comm": ("1001_MI_vs_CSK/1001_MI_vs_CSK_comm.json", "c1")},
+        "1002_RCB_vs_KKR": {"scard": ("1002_RCB_vs_KKR/1002_RCB_vs_KKR_scard.json", "s2")},
+        "1003_GT_vs_RR": {"comm": ("1003_GT_vs_RR/1003_GT_vs_RR_comm.json", "c3")},
+    }
+
+
+def test_never_lists_live_deltas_or_the_bucket_root_objects():
+    s3 = FakeS3(BUCKET)
+    S3Source(s3, "bucket", list_workers=1).list_match_objects()
+    assert s3.calls == ["", "1001_MI_vs_CSK/", "1002_RCB_vs_KKR/", "1003_GT_vs_RR/"]
+
+
+def test_empty_bucket():
+    assert S3Source(FakeS3({}), "bucket").list_match_objects() == {}
@@ -0,0 +1,61 @@
+"""ShadowSwap against the fake connection's table model."""
+import pytest
+
+from conftest import FakeConnection
+from shadow_tables import ShadowSwap
+
+
+def live_gold():
+    return FakeConnection(tables={"gold_a": [("old a",)], "gold_b": [("old b",)], "gold_other": [("untouched",)]})
+
+
+def test_swap_publishes_all_tables_with_one_rename():
+    connection = live_gold()
+    with ShadowSwap(connection, ["gold_a", "gold_b"]) as swap:
+        assert swap.target("gold_a") == "gold_a__shadow"
+        assert swap.target("gold_other") == "gold_other"
+        for table in ("gold_a", "gold_b"):
+            connection.cursor().execute(f"INSERT INTO {swap.target(table)} VALUES (%s)", (f"new {table[-1]}",))
+        # readers still see the previous contents while the shadows fill
+        assert connection.tables["gold_a"] == [("old a",)]
+
+    assert connection.tables == {"gold_a": [("new a",)], "gold_b": [("new b",)], "gold_other": [("untouched",)]}
+    assert len(connection.queries("RENAME TABLE")) == 1
+    assert connection.commits == 1
+
+
+def test_failure_discards_every_shadow():
+    connection = live_gold()
+    with pytest.raises(ValueError):
+        with ShadowSwap(connection, ["gold_a", "gold_b"]) as swap:
+            connection.cursor().execute(f"INSERT INTO {swap.target('gold_a')} VALUES (%s)", ("half built",))
+            raise ValueError("stat failed")
+
+    assert connection.tables == {"gold_a": [("old a",)], "gold_b": [("old b",)], "gold_other": [("untouched",)]}
+    assert connection.queries("RENAME TABLE") == []
+    assert connection.rollbacks == 1
+
+
+def test_discard_keeps_one_table_and_publishes_the_rest():
+    connection = live_gold()
+    with ShadowSwap(connection, ["gold_a", "gold_b"]) as swap:
+        connection.cursor().execute(f"INSERT INTO {swap.target('gold_a')} VALUES (%s)", ("new a",))
+        swap.discard("gold_b")
+        assert swap.target("gold_b") == "gold_b"
+
+    assert connection.tables == {"gold_a": [("new a",)], "gold_b": [("old b",)], "gold_other": [("untouched",)]}
+
+
+def test_leftover_shadow_from_a_crashed_run_is_replaced():
+    connection = live_gold()
+    connection.tables["gold_a__shadow"] = [("stale",)]
+    with ShadowSwap(connection, ["gold_a"]) as swap:
+        assert connection.tables[swap.target("gold_a")] == []
+    assert connection.tables["gold_a"] == []
+
+
+def test_nothing_left_to_publish():
+    connection = live_gold()
+    with ShadowSwap(connection, ["gold_a"]) as swap:
+        swap.discard("gold_a")
+    assert connection.queries("RENAME TABLE") == [] and connection.tables["gold_a"] == [("old a",)]
@@ -0,0 +1,111 @@
+"""standings_engine.compute_standings against TransformProcessor's reference loop."""
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("mysql.connector")
+pytest.importorskip("fuzzywuzzy")
+
+import benchmarks
+import standings_engine
+from transform_processor import TransformProcessor
+
+MI, CSK, RCB, KKR = "Mumbai Indians", "Chennai Super Kings", "Royal Challengers Bengaluru", "Kolkata Knight Riders"
+
+
+def summary(match_id, team1, team2, winner, status="", is_tie=0, is_no_result=0):
+    return {"match_id": match_id, "team1_name": team1, "team2_name": team2, "match_winner": winner,
+            "match_status": status, "is_tie": is_tie, "is_no_result": is_no_result}
+
+
+def both_engines(matches, batting_rows, extras_rows):
+    processor = TransformProcessor._offline()
+    reference = processor._compute_standings_reference(matches, batting_rows, extras_rows)
+    vectorized = standings_engine.compute_standings(matches, batting_rows, extras_rows, processor._normalize_team_name)
+    return reference, vectorized
+
+
+CASES = {
+    "regular win, aliases in the inputs": (
+        [summary("1001_MumbaiIndians_vs_ChennaiSuperKings", "MI", "Chennai", "Mumbai Indians", "MI won by 20 runs")],
+        [("1001_MumbaiIndians_vs_ChennaiSuperKings", "MI", 180, 120, 5),
+         ("1001_MumbaiIndians_vs_ChennaiSuperKings", "CSK", 160, 120, 7)],
+        [("1001_MumbaiIndians_vs_ChennaiSuperKings", MI, 8), ("1001_MumbaiIndians_vs_ChennaiSuperKings", CSK, 4)],
+    ),
+    "super over won by team2": (
+        [summary("1002_RoyalChallengersBengaluru_vs_KolkataKnightRiders", RCB, KKR, None,
+                 "Match tied (Kolkata Knight Riders won the super over)", is_tie=1)],
+        [("1002_RoyalChallengersBengaluru_vs_KolkataKnightRiders", RCB, 170, 120, 6),
+         ("1002_RoyalChallengersBengaluru_vs_KolkataKnightRiders", KKR, 170, 120, 8)],
+        [],
+    ),
+    "super over with an unrecognised winner counts as a tie": (
+        [summary("1003_MumbaiIndians_vs_KolkataKnightRiders", MI, KKR, None,
+                 "Match tied (Somebody Else won the super over)", is_tie=1)],
+        [("1003_MumbaiIndians_vs_KolkataKnightRiders", MI, 150, 120, 9),
+         ("1003_MumbaiIndians_vs_KolkataKnightRiders", KKR, 150, 120, 9)],
+        [],
+    ),
+    "plain tie": (
+        [summary("1004_ChennaiSuperKings_vs_RoyalChallengersBengaluru", CSK, RCB, None, "Match tied", is_tie=1)],
+        [("1004_ChennaiSuperKings_vs_RoyalChallengersBengaluru", CSK, 155, 120, 4),
+         ("1004_ChennaiSuperKings_vs_RoyalChallengersBengaluru", RCB, 155, 120, 10)],
+        [],
+    ),
+    "no result with Unknown teams recovered from the match_id": (
+        [summary("1005_MumbaiIndians_vs_RoyalChallengersBengaluru", None, "Unknown", None, "No result", is_no_result=1),
+         summary("1006_KolkataKnightRiders_vs_ChennaiSuperKings", KKR, None, None, "No result", is_no_result=1),
+         summary("1007_MumbaiIndians_vs_KolkataKnightRiders", MI, KKR, KKR, "KKR won by 6 wkts")],
+        [("1005_MumbaiIndians_vs_RoyalChallengersBengaluru", MI, 40, 24, 1),
+         ("1007_MumbaiIndians_vs_KolkataKnightRiders", MI, 140, 120, 8),
+         ("1007_MumbaiIndians_vs_KolkataKnightRiders", KKR, 141, 100, 4)],
+        [("1005_MumbaiIndians_vs_RoyalChallengersBengaluru", MI, 3)],
+    ),
+    "all out inside 120 balls is charged the full 120": (
+        [summary("1008_ChennaiSuperKings_vs_MumbaiIndians", CSK, MI, CSK, "CSK won by 70 runs"),
+         summary("1009_MumbaiIndians_vs_RoyalChallengersBengaluru", MI, RCB, MI, "MI won by 9 wkts")],
+        [("1008_ChennaiSuperKings_vs_MumbaiIndians", CSK, 200, 120, 6),
+         ("1008_ChennaiSuperKings_vs_MumbaiIndians", MI, 130, 87, 10),
+         ("1009_MumbaiIndians_vs_RoyalChallengersBengaluru", RCB, 95, 102, 10),
+         ("1009_MumbaiIndians_vs_RoyalChallengersBengaluru", MI, 96, 61, 1)],
+        [("1008_ChennaiSuperKings_vs_MumbaiIndians", CSK, 11), ("1008_ChennaiSuperKings_vs_MumbaiIndians", MI, 5),
+         ("1009_MumbaiIndians_vs_RoyalChallengersBengaluru", RCB, 7)],
+    ),
+}
+
+
+@pytest.mark.parametrize("matches, batting_rows, extras_rows", list(CASES.values()), ids=list(CASES))
+def test_matches_reference(matches, batting_rows, extras_rows):
+    reference, vectorized = both_engines(matches, batting_rows, extras_rows)
+    assert vectorized == reference
+
+
+def test_case_outcomes():
+    """Spot-check that the cases above exercise what their names say"""
+    rows = {row[0]: row for row in both_engines(*CASES["super over won by team2"])[1]}
+    assert rows[KKR][2:7] == (1, 0, 0, 0, 2) and rows[RCB][2:7] == (0, 1, 0, 0, 0)
+
+    rows = {row[0]: row for row in both_engines(*CASES["no result with Unknown teams recovered from the match_id"])[1]}
+    assert rows[RCB][1] == 1 and rows[RCB][5] == 1 and rows[CSK][5] == 1 and rows[MI][5] == 1
+
+    rows = {row[0]: row for row in both_engines(*CASES["all out inside 120 balls is charged the full 120"])[1]}
+    # CSK: 211 off 20 overs scored, MI 135 all out conceded over 20 overs, not 14.3
+    assert rows[CSK][7] == round(211 / 20 - 135 / 20, 3)
+
+
+def test_all_cases_together():
+    matches, batting_rows, extras_rows = [], [], []
+    for case_matches, case_batting, case_extras in CASES.values():
+        matches += case_matches; batting_rows += case_batting; extras_rows += case_extras
+    reference, vectorized = both_engines(matches, batting_rows, extras_rows)
+    assert vectorized == reference
+
+
+@pytest.mark.parametrize("seasons", [1, 3])
+def test_synthetic_seasons(seasons):
+    _, matches, batting_rows, extras_rows = benchmarks.standings_inputs(seasons, 74)
+    reference, vectorized = both_engines(matches, batting_rows, extras_rows)
+    assert vectorized == reference
+
+
+def test_no_matches():
+    assert both_engines([], [], []) == ([], [])